@@ -1,15 +1,24 @@
-import pandas as pd
 import random
 
-# Carregar os dados do Excel
+import avaliacao
+import combinacoes
+import construcao
+import progresso
+from avaliacao import NUM_PROCEDURES
+
+# Dados da instância, carregados por load_instance() (nada é lido no import):
+# - tempos: array de inteiros (procedimento x enfermeiro) lido do Excel
+# - tabela: equipas válidas por procedimento, usada na construção e na mutação
 file_path = 'Trab_Grupo.xlsx'
-df = pd.read_excel(file_path)
+tempos = None
+tabela = None
 
-NUM_PROCEDURES = 14
-NUM_NURSES = 10
 POPULATION_SIZE = 30
 GENERATIONS = 2000
+PROGRESS_EVERY = 100  # Gerações entre linhas de progresso
 MUTATION_RATE = 0.05
+# Pesos de avaliacao.evaluate_fitness próprios desta variante (os mesmos de solver.VARIANTS['monteiro'])
+PENALTIES = {'workload_penalty': 1000, 'bonus_threshold': 450, 'bonus': -1000, 'mismatch_penalty': 1000}
 
 # Categorias dos enfermeiros
 categorias = {
@@ -18,54 +27,17 @@ categorias = {
     'E9': 3, 'E10': 3
 }
 
-# Enfermeiros da categoria 1
-enfermeiros_categoria_1 = {0, 1, 2, 3}
-
-# Procedimentos que não podem ser realizados por enfermeiros da categoria 1
-procedimentos_restritos = {2, 6, 7, 9, 11}
+# Carregar a instância: sem argumento lê `file_path`; também aceita o array de tempos já carregado
+def load_instance(instance=None):
+    global tempos, tabela
+    tempos = avaliacao.load_durations(file_path) if instance is None else instance
+    tabela = combinacoes.CombinationTable(tempos)
 
 # Função de avaliação de fitness
+# (pesos do AG_Alex; abaixo de 450 o "bônus" é uma penalidade de 1000, e qualquer diferença entre o fitness
+# e a duração custa mais 1000)
 def evaluate_fitness(cromossoma):
-    fitness = 0
-    enfermeiro_count = [0] * NUM_NURSES
-    total_duration = 0
-    
-    max_times = [[df.iloc[i, enfermeiro] for enfermeiro in procedimento] for i, procedimento in enumerate(cromossoma)]
-
-    for p1, p2 in zip(range(0, 14, 2), range(1, 14, 2)):
-        procedimento1 = cromossoma[p1]
-        procedimento2 = cromossoma[p2]
-        
-        if len(set(procedimento1 + procedimento2)) != 6:
-            fitness += 1000  # Penalidade alta para enfermeiros repetidos no mesmo período
-        
-        duration1 = max(max_times[p1])
-        duration2 = max(max_times[p2])
-        
-        period_duration = max(duration1, duration2)
-        total_duration += period_duration
-        fitness += period_duration
-        
-        for enfermeiro in procedimento1 + procedimento2:
-            enfermeiro_count[enfermeiro] += 1
-            
-            # Penalizar enfermeiro que participa mais de 5 vezes
-            if enfermeiro_count[enfermeiro] > 5:
-                fitness += 1000  # Penalidade alta
-        
-        # Penalizar uso de enfermeiros da categoria 1 em procedimentos restritos
-        if p1 in procedimentos_restritos and any(enfermeiro in enfermeiros_categoria_1 for enfermeiro in procedimento1):
-            fitness += 1000  # Penalidade alta
-        if p2 in procedimentos_restritos and any(enfermeiro in enfermeiros_categoria_1 for enfermeiro in procedimento2):
-            fitness += 1000  # Penalidade alta
-
-    if fitness < 450:
-        fitness += 1000
-
-    if fitness != total_duration:
-        fitness += 1000
-
-    return -fitness, total_duration  # Queremos minimizar a duração total com penalidades
+    return avaliacao.evaluate_fitness(cromossoma, tempos, **PENALTIES)
 
 # Seleção por torneio
 def tournament_selection(population, k=5):
@@ -101,32 +73,18 @@ def mutate(cromossoma, mutation_rate):
             cromossoma[i] = bit_flip_mutation(cromossoma[i], i)
     return cromossoma
 
-# Mutação Bit Flip
+# Mutação Bit Flip - troca um enfermeiro por outro que ainda não esteja na equipa,
+# sorteando diretamente entre as equipas que respeitam as restrições de categoria
 def bit_flip_mutation(procedure, procedure_index):
-    enfermeiros = list(procedure)
     enfermeiro_idx = random.randint(0, 2)  # Escolhe aleatoriamente um dos três enfermeiros
-    while True:
-        new_enfermeiro = random.randint(0, NUM_NURSES - 1)
-        if new_enfermeiro != enfermeiros[enfermeiro_idx]:
-            enfermeiros[enfermeiro_idx] = new_enfermeiro
-            break
-    # Garantir que os enfermeiros respeitam as restrições de categoria
-    if procedure_index in procedimentos_restritos and any(enfermeiro in enfermeiros_categoria_1 for enfermeiro in enfermeiros):
-        return bit_flip_mutation(procedure, procedure_index)  # Repetir até que a restrição seja satisfeita
-    return tuple(enfermeiros)
-
-# Gera um procedimento válido considerando as restrições
-def generate_valid_procedure(procedure_index):
-    while True:
-        enfermeiros = (random.randint(0, NUM_NURSES-1), random.randint(0, NUM_NURSES-1), random.randint(0, NUM_NURSES-1))
-        if (procedure_index in procedimentos_restritos and all(enfermeiro not in enfermeiros_categoria_1 for enfermeiro in enfermeiros)) or (procedure_index not in procedimentos_restritos):
-            return enfermeiros
-
-# Inicializar a população
+    novo = tabela.replace_nurse(procedure_index, combinacoes.INDICES[procedure], enfermeiro_idx)
+    return combinacoes.COMBINACOES[novo]
+
+# Inicializar a população com a amostragem construtiva (sem ciclos de rejeição)
 def initialize_population(size):
     population = []
     for _ in range(size):
-        individual = [generate_valid_procedure(i) for i in range(NUM_PROCEDURES)]
+        individual = combinacoes.decode(construcao.construct(tabela))
         population.append(individual)
     return population
 
@@ -143,20 +101,26 @@ def evolve_population(population, mutation_rate):
     return new_population
 
 # Função principal do algoritmo genético
-def genetic_algorithm():
+def genetic_algorithm(observer=None):
+    if tabela is None:
+        load_instance()
     population = initialize_population(POPULATION_SIZE - 1)
     for generation in range(GENERATIONS):
         population = evolve_population(population, MUTATION_RATE)
         best_fitness, best_duration = max((evaluate_fitness(individual) for individual in population), key=lambda x: x[0])
-        print(f'Geração {generation}: Melhor Fitness = {best_fitness}, Duração = {best_duration}')
+        if observer is not None:
+            observer(generation, best_fitness, best_duration)
 
     best_solution = max(population, key=lambda x: evaluate_fitness(x)[0])
     best_fitness, best_duration = evaluate_fitness(best_solution)
     return best_solution, best_fitness, best_duration
 
-# Executar o algoritmo genético
-best_solution, best_fitness, best_duration = genetic_algorithm()
-print('Melhor solução encontrada:')
-print(best_solution)
-print(f'Melhor Fitness: {best_fitness}, Duração Total: {best_duration}')
+if __name__ == '__main__':
+    load_instance()
 
+    # Executar o algoritmo genético
+    best_solution, best_fitness, best_duration = genetic_algorithm(
+        observer=progresso.Throttle(progresso.print_progress, every_generations=PROGRESS_EVERY))
+    print('Melhor solução encontrada:')
+    print(best_solution)
+    print(f'Melhor Fitness: {best_fitness}, Duração Total: {best_duration}')
@@ -1,16 +1,17 @@
-from matplotlib import pyplot as plt
-import pandas as pd
 import random
 
-# Carregar os dados do Excel
+import avaliacao
+import combinacoes
+import progresso
+from avaliacao import NUM_PROCEDURES, MAX_NURSES_PER_PROCEDURE
+
+# Durações (procedimento x enfermeiro) lidas do Excel por load_instance() (nada é lido no import)
 file_path = 'Trab_Grupo.xlsx'
-df = pd.read_excel(file_path)
+tempos = None
 
-NUM_PROCEDURES = 14
-NUM_NURSES = 10
-MAX_NURSES_PER_PROCEDURE = 3
 POPULATION_SIZE = 50
 GENERATIONS = 3000
+PROGRESS_EVERY = 100  # Gerações entre linhas de progresso
 MUTATION_RATE = 0.1
 
 # Categorias dos enfermeiros
@@ -20,54 +21,15 @@ categorias = {
     'E9': 3, 'E10': 3
 }
 
-# Enfermeiros da categoria 1
-enfermeiros_categoria_1 = {0, 1, 2, 3}
+# Carregar a instância: sem argumento lê `file_path`; também aceita o array de tempos já carregado
+def load_instance(instance=None):
+    global tempos
+    tempos = avaliacao.load_durations(file_path) if instance is None else instance
 
-# Procedimentos que não podem ser realizados por enfermeiros da categoria 1
-procedimentos_restritos = {2, 6, 7, 9, 11}
 
 # Função de avaliação de fitness
 def evaluate_fitness(cromossoma):
-    fitness = 0
-    enfermeiro_count = [0] * NUM_NURSES
-    total_duration = 0
-    
-    # Period pairs as given in the assignment
-    period_pairs = [(0, 1), (2, 3), (4, 5), (6, 7), (8, 9), (10, 11), (12, 13)]
-    
-    max_times = [[df.iloc[i, enfermeiro] for enfermeiro in procedimento] for i, procedimento in enumerate(cromossoma)]
-
-    for p1, p2 in period_pairs:
-        procedimento1 = cromossoma[p1]
-        procedimento2 = cromossoma[p2]
-        
-        if len(set(procedimento1 + procedimento2)) != 6:
-            fitness += 1000  # Penalidade alta para enfermeiros repetidos no mesmo período
-        
-        duration1 = max(max_times[p1])
-        duration2 = max(max_times[p2])
-        
-        period_duration = max(duration1, duration2)
-        total_duration += period_duration
-        fitness += period_duration
-        
-        for enfermeiro in procedimento1 + procedimento2:
-            enfermeiro_count[enfermeiro] += 1
-            
-            # Penalizar enfermeiro que participa mais de 5 vezes
-            if enfermeiro_count[enfermeiro] > 5:
-                fitness += 250  # Penalidade alta
-        
-        # Penalizar uso de enfermeiros da categoria 1 em procedimentos restritos
-        if p1 in procedimentos_restritos and any(enfermeiro in enfermeiros_categoria_1 for enfermeiro in procedimento1):
-            fitness += 1000  # Penalidade alta
-        if p2 in procedimentos_restritos and any(enfermeiro in enfermeiros_categoria_1 for enfermeiro in procedimento2):
-            fitness += 1000  # Penalidade alta
-    
-    if fitness < 460:
-        fitness -=200            
-    
-    return -fitness, total_duration  # Queremos minimizar a duração total com penalidades
+    return avaliacao.evaluate_fitness(cromossoma, tempos)
 
 
 # Seleção por torneio
@@ -106,16 +68,10 @@ def mutate(cromossoma, mutation_rate, mutation_type='bit_flip'):
                 cromossoma = inversion_mutation(cromossoma)
     return cromossoma
 
-# Mutação Bit Flip - Muda um enfermeiro aleatório da Tupla
+# Mutação Bit Flip - Muda um enfermeiro aleatório da Tupla por um que ainda não esteja na equipa
 def bit_flip_mutation(procedure):
-    enfermeiros = list(procedure)
     enfermeiro_idx = random.randint(0, MAX_NURSES_PER_PROCEDURE - 1)  # Escolhe aleatoriamente um dos três enfermeiros
-    while True:
-        new_enfermeiro = random.randint(0, NUM_NURSES - 1)
-        if new_enfermeiro != enfermeiros[enfermeiro_idx]:
-            enfermeiros[enfermeiro_idx] = new_enfermeiro
-            break
-    return tuple(enfermeiros)
+    return combinacoes.replace_nurse(procedure, enfermeiro_idx)
 
 # Mutação Bit Flip - Pode mudar entre 1 e 3 enfermeiros da Tupla.
 # def bit_flip_mutation(procedure):
@@ -148,11 +104,11 @@ def inversion_mutation(cromossoma):
 #         if (procedure_index in procedimentos_restritos and all(enfermeiro not in enfermeiros_categoria_1 for enfermeiro in enfermeiros)) or (procedure_index not in procedimentos_restritos):
 #             return enfermeiros
 
-# Inicializar a população aleatória
+# Inicializar a população aleatória com equipas canónicas
 def initialize_population(size):
     population = []
     for _ in range(size):
-        individual = [(random.randint(0, NUM_NURSES-1), random.randint(0, NUM_NURSES-1), random.randint(0, NUM_NURSES-1)) for _ in range(NUM_PROCEDURES)]
+        individual = [combinacoes.random_team() for _ in range(NUM_PROCEDURES)]
         population.append(individual)
     return population
 
@@ -168,10 +124,11 @@ def evolve_population(population):
         new_population.extend([child1, child2])
     return new_population
 
-def genetic_algorithm():
+def genetic_algorithm(observer=None):
+    if tempos is None:
+        load_instance()
     population = initialize_population(POPULATION_SIZE - 1)
-    best_fitness_over_generations = []
-    best_duration_over_generations = []
+    metricas = progresso.GenerationMetrics(GENERATIONS)
 
     # Inicializar as variáveis para a melhor solução global
     global_best_fitness = float('-inf')
@@ -187,34 +144,39 @@ def genetic_algorithm():
                 global_best_duration = duration
                 global_best_solution = individual
         
-        best_fitness_over_generations.append(global_best_fitness)
-        best_duration_over_generations.append(global_best_duration)
-        print(f'Geração {generation}: Melhor Fitness = {global_best_fitness}, Duração = {global_best_duration}')
-
-    return global_best_solution, global_best_fitness, global_best_duration, best_fitness_over_generations, best_duration_over_generations
-
-# Executar o algoritmo genético
-best_solution, best_fitness, best_duration, best_fitness_over_generations, best_duration_over_generations = genetic_algorithm()
-
-# Imprimir a melhor solução encontrada
-print('Melhor solução encontrada:')
-print(best_solution)
-print(f'Melhor Fitness: {best_fitness}, Duração Total: {best_duration}')
-
-# # Plotar gráfico com valores absolutos
-# best_fitness_over_generations_abs = [abs(fitness) for fitness in best_fitness_over_generations]
-# plt.plot(range(len(best_fitness_over_generations_abs)), best_fitness_over_generations_abs)
-# plt.xlabel('Gerações')
-# plt.ylabel('Melhor Fitness (Valores Absolutos)')
-# plt.ylim(425, 500)
-# plt.title('Evolução do Fitness ao Longo das Gerações (Valores Absolutos)')
-# plt.show()
-
-# Plotar gráfico com a evolução da duração total
-# plt.plot(range(len(best_duration_over_generations)), best_duration_over_generations)
-# plt.xlabel('Gerações')
-# plt.axhline(y=480, color='r', linestyle='--', label='Linha Horizontal em y=480')  # Adicionar linha horizontal
-# plt.ylabel('Duração Total')
-# plt.ylim(435, 520)
-# plt.title('Evolução da Duração Total ao Longo das Gerações')
-# plt.show()
\ No newline at end of file
+        metricas.record(global_best_fitness, global_best_duration)
+        if observer is not None:
+            observer(generation, global_best_fitness, global_best_duration)
+
+    return global_best_solution, global_best_fitness, global_best_duration, metricas.best_fitness, metricas.best_duration
+
+if __name__ == '__main__':
+    load_instance()
+
+    # Executar o algoritmo genético
+    best_solution, best_fitness, best_duration, best_fitness_over_generations, best_duration_over_generations = genetic_algorithm(
+        observer=progresso.Throttle(progresso.print_progress, every_generations=PROGRESS_EVERY))
+
+    # Imprimir a melhor solução encontrada
+    print('Melhor solução encontrada:')
+    print(best_solution)
+    print(f'Melhor Fitness: {best_fitness}, Duração Total: {best_duration}')
+
+    # # Plotar gráfico com valores absolutos
+    # from matplotlib import pyplot as plt
+    # best_fitness_over_generations_abs = [abs(fitness) for fitness in best_fitness_over_generations]
+    # plt.plot(range(len(best_fitness_over_generations_abs)), best_fitness_over_generations_abs)
+    # plt.xlabel('Gerações')
+    # plt.ylabel('Melhor Fitness (Valores Absolutos)')
+    # plt.ylim(425, 500)
+    # plt.title('Evolução do Fitness ao Longo das Gerações (Valores Absolutos)')
+    # plt.show()
+
+    # Plotar gráfico com a evolução da duração total
+    # plt.plot(range(len(best_duration_over_generations)), best_duration_over_generations)
+    # plt.xlabel('Gerações')
+    # plt.axhline(y=480, color='r', linestyle='--', label='Linha Horizontal em y=480')  # Adicionar linha horizontal
+    # plt.ylabel('Duração Total')
+    # plt.ylim(435, 520)
+    # plt.title('Evolução da Duração Total ao Longo das Gerações')
+    # plt.show()
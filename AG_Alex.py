@@ -1,19 +1,29 @@
-import pandas as pd
 import random
 
-# Carregar os dados do Excel
+import avaliacao
+import combinacoes
+import construcao
+import exato
+import progresso
+from avaliacao import NUM_PROCEDURES
+
+# Dados da instância, carregados por load_instance() (nada é lido nem calculado no import):
+# - tempos: array de inteiros (procedimento x enfermeiro) lido do Excel
+# - tabela: equipas válidas por procedimento, usada na construção, na mutação e na reparação
+# - TARGET_DURATION: duração mínima provada pelo solver exato; o algoritmo para quando a atinge (ou ao fim
+#   de GENERATIONS). None se a instância não tiver solução admissível.
 file_path = 'Trab_Grupo.xlsx'
-df = pd.read_excel(file_path)
+tempos = None
+tabela = None
+TARGET_DURATION = None
 
-NUM_PROCEDURES = 14
-NUM_NURSES = 10
 POPULATION_SIZE = 100
 GENERATIONS = 500
+PROGRESS_EVERY = 10  # Gerações entre linhas de progresso
 MUTATION_RATE = 0.05
 
 CROSSOVER_TYPE = 'two-point'  # one-point, two-point, uniform
 SELECTION_TYPE = 'tournament'  # tournament, fitness-proportional, rank, random
-MUTATION_TYPE = 'inversion'  # bit-flip, inversion, swap
 # Categorias dos enfermeiros
 categorias = {
     'E1': 1, 'E2': 1, 'E3': 1, 'E4': 1,
@@ -21,12 +31,6 @@ categorias = {
     'E9': 3, 'E10': 3
 }
 
-# Enfermeiros da categoria 1
-enfermeiros_categoria_1 = {0, 1, 2, 3}
-
-# Procedimentos que não podem ser realizados por enfermeiros da categoria 1
-procedimentos_restritos = {2, 6, 7, 9, 11}
-
 # Cromossoma inicial fornecido
 initial_solution = [
     (2, 3, 5), (1, 7, 9),  # P1, P2
@@ -39,46 +43,18 @@ initial_solution = [
 ]
 
 
-# Função de avaliação de fitness
-def evaluate_fitness(cromossoma):
-    fitness = 0
-    enfermeiro_count = [0] * NUM_NURSES
-    total_duration = 0
-
-    # Period pairs as given in the assignment
-    period_pairs = [(0, 1), (2, 3), (4, 5), (6, 7), (8, 9), (10, 11), (12, 13)]
-
-    for p1, p2 in period_pairs:
-        procedimento1 = cromossoma[p1]
-        procedimento2 = cromossoma[p2]
-
-        if len(set(procedimento1 + procedimento2)) != 6:
-            fitness += 1000  # Penalidade alta para enfermeiros repetidos no mesmo período
-
-        times1 = [df.iloc[p1, enfermeiro] for enfermeiro in procedimento1]
-        times2 = [df.iloc[p2, enfermeiro] for enfermeiro in procedimento2]
-
-        duration1 = max(times1)
-        duration2 = max(times2)
+# Carregar a instância: sem argumento lê `file_path`; também aceita o array de tempos já carregado
+def load_instance(instance=None):
+    global tempos, tabela, TARGET_DURATION
+    tempos = avaliacao.load_durations(file_path) if instance is None else instance
+    tabela = combinacoes.CombinationTable(tempos)
+    otimo = exato.solve(tabela)
+    TARGET_DURATION = None if otimo is None else otimo['duration']
 
-        period_duration = max(duration1, duration2)
-        total_duration += period_duration
-        fitness += period_duration
 
-        for enfermeiro in procedimento1 + procedimento2:
-            enfermeiro_count[enfermeiro] += 1
-
-            # Penalizar enfermeiro que participa mais de 5 vezes
-            if enfermeiro_count[enfermeiro] > 5:
-                fitness += 1000  # Penalidade alta
-
-        # Penalizar uso de enfermeiros da categoria 1 em procedimentos restritos
-        if p1 in procedimentos_restritos and any(enfermeiro in enfermeiros_categoria_1 for enfermeiro in procedimento1):
-            fitness += 1000  # Penalidade alta
-        if p2 in procedimentos_restritos and any(enfermeiro in enfermeiros_categoria_1 for enfermeiro in procedimento2):
-            fitness += 1000  # Penalidade alta
-
-    return -fitness, total_duration  # Queremos minimizar a duração total com penalidades
+# Função de avaliação de fitness
+def evaluate_fitness(cromossoma):
+    return avaliacao.evaluate_fitness(cromossoma, tempos, workload_penalty=1000, bonus=0)
 
 
 # Seleção por torneio
@@ -147,55 +123,18 @@ def uniform_crossover(parent1, parent2):
     return child1, child2
 
 
-# Operador de mutação (Bit Flip)
-def mutate(cromossoma, mutation_rate):
-    for i in range(len(cromossoma)):
-        if random.random() < mutation_rate:
-            if MUTATION_TYPE == 'bit-flip':
-                cromossoma[i] = bit_flip_mutation(cromossoma[i], i)
-            elif MUTATION_TYPE == 'inversion':
-                cromossoma[i] = inversion_mutation(cromossoma[i])
-            elif MUTATION_TYPE == 'swap':
-                cromossoma[i] = swap_mutation(cromossoma[i])
-    return cromossoma
-
-
-# Mutação Bit Flip
-def bit_flip_mutation(procedure, procedure_index, max_attempts=100):
-    enfermeiros = list(procedure)
+# Mutação Bit Flip - troca um enfermeiro por outro que ainda não esteja na equipa.
+# As mutações de inversão e troca dentro da tupla foram removidas: com equipas canónicas (ordenadas)
+# não alteram o cromossoma e só gastavam avaliações.
+def bit_flip_mutation(procedure, procedure_index):
     enfermeiro_idx = random.randint(0, 2)  # Escolhe aleatoriamente um dos três enfermeiros
 
-    for attempt in range(max_attempts):
-        new_enfermeiro = random.randint(0, NUM_NURSES - 1)
-        if new_enfermeiro != enfermeiros[enfermeiro_idx]:
-            enfermeiros[enfermeiro_idx] = new_enfermeiro
-
-            # Verificar a restrição de categoria
-            if procedure_index not in procedimentos_restritos or all(
-                    enfermeiro not in enfermeiros_categoria_1 for enfermeiro in enfermeiros):
-                return tuple(enfermeiros)
-
-    # Se não encontrar uma mutação válida, retorna o procedimento original
-    return procedure
-
-
-# Mutação de inversão
-def inversion_mutation(procedure):
-    enfermeiros = list(procedure)
-    i, j = sorted(random.sample(range(3), 2))  # Escolhe aleatoriamente dois índices diferentes para inversão
-    enfermeiros[i:j+1] = reversed(enfermeiros[i:j+1])
-    return tuple(enfermeiros)
+    # Sorteio direto entre as equipas vizinhas que respeitam a restrição de categoria
+    novo = tabela.replace_nurse(procedure_index, combinacoes.INDICES[procedure], enfermeiro_idx)
+    return combinacoes.COMBINACOES[novo]
 
 
-# Mutação de troca
-def swap_mutation(procedure):
-    enfermeiros = list(procedure)
-    i, j = random.sample(range(3), 2)  # Escolhe aleatoriamente dois índices diferentes para troca
-    enfermeiros[i], enfermeiros[j] = enfermeiros[j], enfermeiros[i]
-    return tuple(enfermeiros)
-
-
-# Função de mutação (Bit Flip) revisada para usar a nova versão de bit_flip_mutation
+# Operador de mutação (Bit Flip)
 def mutate(cromossoma, mutation_rate):
     for i in range(len(cromossoma)):
         if random.random() < mutation_rate:
@@ -204,24 +143,20 @@ def mutate(cromossoma, mutation_rate):
     return cromossoma
 
 
-# Gera um procedimento válido considerando as restrições
-def generate_valid_procedure(procedure_index):
-    while True:
-        enfermeiros = (
-        random.randint(0, NUM_NURSES - 1), random.randint(0, NUM_NURSES - 1), random.randint(0, NUM_NURSES - 1))
-
-        return enfermeiros
-
-
-# Inicializar a população
+# Inicializar a população com a amostragem construtiva (indivíduos já admissíveis)
 def initialize_population(size):
     population = []
     for _ in range(size):
-        individual = [generate_valid_procedure(i) for i in range(NUM_PROCEDURES)]
+        individual = combinacoes.decode(construcao.construct(tabela))
         population.append(individual)
     return population
 
 
+# Reparar um filho (repetidos no período, categoria e carga) em vez de depender só das penalidades
+def repair(cromossoma):
+    return combinacoes.decode(construcao.repair(tabela, combinacoes.encode(cromossoma)))
+
+
 # Atualização da população
 def evolve_population(population, mutation_rate):
     new_population = []
@@ -246,21 +181,23 @@ def evolve_population(population, mutation_rate):
         elif CROSSOVER_TYPE == 'uniform':
             child1, child2 = uniform_crossover(parent1, parent2)
 
-        child1 = mutate(child1, mutation_rate)
-        child2 = mutate(child2, mutation_rate)
+        child1 = repair(mutate(child1, mutation_rate))
+        child2 = repair(mutate(child2, mutation_rate))
         new_population.extend([child1, child2])
     return new_population
 
 
 # Função principal do algoritmo genético
-def genetic_algorithm():
+def genetic_algorithm(observer=None):
+    if tabela is None:
+        load_instance()
     old_fitness = 0
     count = 0
     MUTATION_RATE = 0.05
     population = initialize_population(POPULATION_SIZE)
     generation = 0
     best_duration = 999999
-    while best_duration > 420:
+    while (TARGET_DURATION is None or best_duration > TARGET_DURATION) and generation < GENERATIONS:
         population = evolve_population(population, MUTATION_RATE)
         best_fitness, best_duration = max((evaluate_fitness(individual) for individual in population),
                                           key=lambda x: x[0])
@@ -272,8 +209,8 @@ def genetic_algorithm():
             old_fitness = best_fitness
         if count >= 20:
             MUTATION_RATE = 0.1
-            print(f'Mutation rate increased to {MUTATION_RATE}')
-        print(f'Geração {generation}: Melhor Fitness = {best_fitness}, Duração = {best_duration}')
+        if observer is not None:
+            observer(generation, best_fitness, best_duration)
         generation += 1
 
     best_solution = max(population, key=lambda x: evaluate_fitness(x)[0])
@@ -281,19 +218,25 @@ def genetic_algorithm():
     return best_solution, best_fitness, best_duration
 
 
-# Executar o algoritmo genético
-# Print Start time
-print('Start Time')
-start_time = pd.Timestamp.now()
-print(start_time)
-best_solution, best_fitness, best_duration = genetic_algorithm()
-print('Melhor solução encontrada:')
-print(best_solution)
-print(f'Melhor Fitness: {best_fitness}, Duração Total: {best_duration}')
-# Print End time
-print('End Time')
-end_time = pd.Timestamp.now()
-print(end_time)
-# Print Duration
-print('Duration')
-print(end_time - start_time)
+if __name__ == '__main__':
+    import pandas as pd
+
+    load_instance()
+
+    # Executar o algoritmo genético
+    # Print Start time
+    print('Start Time')
+    start_time = pd.Timestamp.now()
+    print(start_time)
+    best_solution, best_fitness, best_duration = genetic_algorithm(
+        observer=progresso.Throttle(progresso.print_progress, every_generations=PROGRESS_EVERY))
+    print('Melhor solução encontrada:')
+    print(best_solution)
+    print(f'Melhor Fitness: {best_fitness}, Duração Total: {best_duration}')
+    # Print End time
+    print('End Time')
+    end_time = pd.Timestamp.now()
+    print(end_time)
+    # Print Duration
+    print('Duration')
+    print(end_time - start_time)
@@ -1,14 +1,26 @@
-from matplotlib import pyplot as plt
-import pandas as pd
-import random
-
-# Carregar os dados do Excel
+import itertools
+import time
+
+import numpy as np
+
+import avaliacao
+import busca_local
+import combinacoes
+import construcao
+import exato
+import perfil
+import progresso
+from avaliacao import NUM_PROCEDURES, MAX_NURSES_PER_PROCEDURE
+
+# Dados da instância, carregados por load_instance() (nada é lido no import):
+# - tempos: array de inteiros (procedimento x enfermeiro) lido do Excel
+# - tabela: cada gene é o índice de uma das 120 equipas canónicas; dá a duração e a validade de cada uma
+# - limite_inferior: limite inferior admissível da duração total (uma solução admissível com esta duração é ótima)
 file_path = 'Trab_Grupo.xlsx'
-df = pd.read_excel(file_path)
+tempos = None
+tabela = None
+limite_inferior = None
 
-NUM_PROCEDURES = 14
-NUM_NURSES = 10
-MAX_NURSES_PER_PROCEDURE = 3
 POPULATION_SIZE = 50
 GENERATIONS = 3000
 CROSSOVER_TYPE = 'multi-point'  # multi-point, uniform
@@ -17,6 +29,16 @@ SELECTION_TYPE = 'tournament'  # tournament, fitness-proportional, rank, random
 TOURNAMENT_K = 6
 MUTATION_TYPE = 'random_reseting'  # 'random_reseting', 'swap'
 MUTATION_RATE = 0.1
+REPAIR = True  # Reparar os filhos (repetidos no período, categoria e carga) em vez de depender só das penalidades
+PENALTIES = {}  # Pesos que substituem os de avaliacao.evaluate_fitness (ex.: {'workload_penalty': 1000, 'bonus': 0})
+CACHE_SIZE = 20000  # Máximo de cromossomas guardados na cache de fitness (0 desativa)
+MEMETIC = None  # None, 'first', 'best': hill-climbing (first/best improvement) sobre os melhores filhos
+MEMETIC_TOP_K = 2  # Filhos melhorados pela busca local em cada geração
+TIME_BUDGET = None  # Prazo em segundos (ex.: 0.2); com prazo, GENERATIONS é ignorado
+PROGRESS_EVERY = 100  # Gerações entre linhas de progresso quando o script é executado diretamente
+PROFILE = False  # Medir tempo e chamadas por fase (seleção, crossover, ...); o resumo fica em stats['profile']
+PROFILE_MEMORY = False  # Com PROFILE, medir também as alocações com o tracemalloc (abranda a execução)
+PROFILE_FILE = None  # Com PROFILE, ficheiro JSON onde o resumo é gravado no fim da execução
 
 
 # Categorias dos enfermeiros
@@ -26,238 +48,330 @@ categorias = {
     'E9': 3, 'E10': 3
 }
 
-# Enfermeiros da categoria 1
-enfermeiros_categoria_1 = {0, 1, 2, 3}
-
-# Procedimentos que não podem ser realizados por enfermeiros da categoria 1
-procedimentos_restritos = {2, 6, 7, 9, 11}
-
+# Cache de fitness partilhada pelas avaliações da população
+cache = avaliacao.FitnessCache(CACHE_SIZE)
 
-# Função de avaliação de fitness
-def evaluate_fitness(cromossoma):
-    fitness = 0
-    enfermeiro_count = [0] * NUM_NURSES
-    total_duration = 0
+# Estatísticas da última execução de genetic_algorithm()
+stats = {}
 
-    # Pares de períodos conforme a restrição do enunciado
-    period_pairs = [(0, 1), (2, 3), (4, 5), (6, 7), (8, 9), (10, 11), (12, 13)]
+# Cromossomas já levados a um ótimo local pelo passo memético
+otimos_locais = set()
 
-    max_times = [[df.iloc[i, enfermeiro] for enfermeiro in procedimento] for i, procedimento in enumerate(cromossoma)]
+# Gerador NumPy usado pelos operadores vetorizados de crossover e mutação
+rng = np.random.default_rng()
 
-    for p1, p2 in period_pairs:
-        procedimento1 = cromossoma[p1]
-        procedimento2 = cromossoma[p2]
+# Instrumentação da execução em curso (perfil.DISABLED quando PROFILE está desligado)
+profiler = perfil.DISABLED
 
-        if len(set(procedimento1 + procedimento2)) != 6:
-            fitness += 1000  # Penalidade alta para enfermeiros repetidos no mesmo período
 
-        duration1 = max(max_times[p1])
-        duration2 = max(max_times[p2])
+# Carregar a instância: sem argumento lê `file_path`; também aceita o array de tempos já carregado
+# (e, nesse caso, a tabela de combinações e o limite inferior já calculados para ele)
+def load_instance(instance=None, table=None, lower_bound=None):
+    global tempos, tabela, limite_inferior
+    tempos = avaliacao.load_durations(file_path) if instance is None else instance
+    tabela = combinacoes.CombinationTable(tempos) if table is None else table
+    limite_inferior = exato.lower_bound(tabela) if lower_bound is None else lower_bound
+    # Os fitness guardados e os ótimos locais eram da instância anterior
+    cache.clear()
+    otimos_locais.clear()
 
-        period_duration = max(duration1, duration2)
-        total_duration += period_duration
-        fitness += period_duration
 
-        for enfermeiro in procedimento1 + procedimento2:
-            enfermeiro_count[enfermeiro] += 1
+# Função de avaliação de fitness
+def evaluate_fitness(cromossoma):
+    return tabela.evaluate(cromossoma, **PENALTIES)
+
+
+# Avaliação de toda a população numa única passagem NumPy; os cromossomas já vistos vêm da cache
+def evaluate_population(population):
+    if not CACHE_SIZE:
+        return tabela.evaluate_population(population, **PENALTIES)
+    cache.maxsize = CACHE_SIZE
+
+    fitness_scores = np.empty(len(population), dtype=np.int64)
+    durations = np.empty(len(population), dtype=np.int64)
+    chaves = [bytes(individual) for individual in population]  # 14 bytes por cromossoma (índices < 256)
+    em_falta = []
+    for i, chave in enumerate(chaves):
+        resultado = cache.get(chave)
+        if resultado is None:
+            em_falta.append(i)
+        else:
+            fitness_scores[i], durations[i] = resultado
 
-            # Penalizar enfermeiro que participa mais de 5 vezes
-            if enfermeiro_count[enfermeiro] > 5:
-                fitness += 250  # Penalidade alta
+    if em_falta:
+        fitness, duration = tabela.evaluate_population(population[em_falta], **PENALTIES)
+        for i, f, d in zip(em_falta, fitness.tolist(), duration.tolist()):
+            fitness_scores[i] = f
+            durations[i] = d
+            cache.put(chaves[i], (f, d))
 
-        # Penalizar uso de enfermeiros da categoria 1 em procedimentos restritos
-        if p1 in procedimentos_restritos and any(enfermeiro in enfermeiros_categoria_1 for enfermeiro in procedimento1):
-            fitness += 1000
-        if p2 in procedimentos_restritos and any(enfermeiro in enfermeiros_categoria_1 for enfermeiro in procedimento2):
-            fitness += 1000
+    return fitness_scores, durations
 
-    # Bônus para soluções com fitness < 460
-    if fitness < 460:
-        fitness -= 200
 
-    return -fitness, total_duration  # Queremos minimizar a duração total com penalidades
+# Solução sem penalidades (o bônus só pode baixar o fitness abaixo da duração)
+def is_feasible(fitness, duration):
+    return -fitness <= duration
 
 
-# Seleção por torneio
-def tournament_selection(population, k=6):
-    selected = random.sample(population, k)
-    selected.sort(key=lambda x: evaluate_fitness(x), reverse=True)
-    return selected[0]
+# Seleção por torneio: `n` torneios de k indivíduos distintos sorteados de uma só vez (devolve índices).
+# Os k participantes de cada torneio são amostrados sem reposição pelo algoritmo de Floyd (k sorteios vetorizados).
+def tournament_selection(fitness_scores, n, k=6):
+    size = len(fitness_scores)
+    selected = np.empty((n, k), dtype=np.intp)
+    for c, j in enumerate(range(size - k, size)):
+        t = rng.integers(0, j + 1, n)
+        repetido = (selected[:, :c] == t[:, None]).any(axis=1)
+        selected[:, c] = np.where(repetido, j, t)
+    return selected[np.arange(n), fitness_scores[selected].argmax(axis=1)]
 
 
 # Seleção proporcional ao fitness
-def fitness_proportional_selection(population):
-    fitness_scores = [evaluate_fitness(individual)[0] for individual in population]
-    total_fitness = sum(fitness_scores)
-    probabilities = [fitness / total_fitness for fitness in fitness_scores]
-
-    selected = random.choices(population, weights=probabilities, k=1)[0]
-    return selected
+def fitness_proportional_selection(fitness_scores, n):
+    probabilities = fitness_scores / fitness_scores.sum()
+    return rng.choice(len(fitness_scores), size=n, p=probabilities)
 
 
 # Seleção por ranking
-def rank_selection(population):
-    sorted_population = sorted(population, key=lambda x: evaluate_fitness(x)[0], reverse=True)
-    rank_weights = [1 / (i + 1) for i in range(len(sorted_population))]
-
-    selected = random.choices(sorted_population, weights=rank_weights, k=1)[0]
-    return selected
+def rank_selection(fitness_scores, n):
+    ranking = np.argsort(-fitness_scores, kind='stable')
+    rank_weights = 1 / np.arange(1, len(ranking) + 1)
+    return rng.choice(ranking, size=n, p=rank_weights / rank_weights.sum())
 
 
 # Seleção aleatória
-def random_selection(population):
-    selected = random.choice(population)
-    return selected
+def random_selection(fitness_scores, n):
+    return rng.integers(0, len(fitness_scores), n)
 
 
-# Operador de crossover de K pontos
-def multi_point_crossover(parent1, parent2, num_points=5):
-    # Garante que não haja duplicação de pontos de crossover
-    points = sorted(random.sample(range(1, len(parent1)), num_points))
+# Índices de todos os pais da geração, conforme o método de seleção
+def select_parents(fitness_scores, n):
+    match SELECTION_TYPE:
+        case 'tournament':
+            return tournament_selection(fitness_scores, n, TOURNAMENT_K)
+        case 'fitness-proportional':
+            return fitness_proportional_selection(fitness_scores, n)
+        case 'rank':
+            return rank_selection(fitness_scores, n)
+        case 'random':
+            return random_selection(fitness_scores, n)
 
-    # Inicializa os filhos com cópias dos pais
-    child1, child2 = parent1[:], parent2[:]
 
-    # Alterna segmentos entre os pais
-    for i in range(len(points)):
-        if i % 2 == 0:
-            child1[points[i]:points[i + 1] if i + 1 < len(points) else None], \
-                child2[points[i]:points[i + 1] if i + 1 < len(points) else None] = \
-                parent2[points[i]:points[i + 1] if i + 1 < len(points) else None], \
-                parent1[points[i]:points[i + 1] if i + 1 < len(points) else None]
+# Operador de crossover de K pontos, aplicado a todos os pares de pais de uma vez
+def multi_point_crossover(parents1, parents2, num_points=5):
+    # Pontos de crossover distintos para cada par (entre 1 e NUM_PROCEDURES - 1)
+    points = np.argsort(rng.random((len(parents1), NUM_PROCEDURES - 1)), axis=1)[:, :num_points] + 1
 
-    return child1, child2
+    # Alterna segmentos entre os pais: o gene vem do outro pai quando há um número ímpar de pontos até ele
+    mascara = (points[:, None, :] <= np.arange(NUM_PROCEDURES)[None, :, None]).sum(axis=2) % 2 == 1
 
+    return np.where(mascara, parents2, parents1), np.where(mascara, parents1, parents2)
 
-# Operador de crossover uniforme
-def uniform_crossover(parent1, parent2):
-    child1 = []
-    child2 = []
 
-    for i in range(NUM_PROCEDURES):
-        if random.random() < 0.5:
-            child1.append(parent1[i])
-            child2.append(parent2[i])
-        else:
-            child1.append(parent2[i])
-            child2.append(parent1[i])
+# Operador de crossover uniforme, aplicado a todos os pares de pais de uma vez
+def uniform_crossover(parents1, parents2):
+    mascara = rng.random(parents1.shape) < 0.5
+    return np.where(mascara, parents1, parents2), np.where(mascara, parents2, parents1)
+
 
-    return child1, child2
+# Mutação de toda a população: a máscara indica os genes a mutar
+def mutate(population, mutation_rate):
+    mascara = rng.random(population.shape) < mutation_rate
+    if MUTATION_TYPE == 'random_reseting':
+        random_resetting_mutation(population, mascara)
+    elif MUTATION_TYPE == 'swap':
+        swap_mutation(population, mascara)
+    return population
 
 
-def mutate(cromossoma, mutation_rate):
-    for i in range(len(cromossoma)):
-        if random.random() < mutation_rate:
-            if MUTATION_TYPE == 'random_reseting':
-                cromossoma[i] = random_resetting_mutation(cromossoma[i])
-            elif MUTATION_TYPE == 'swap':
-                cromossoma = swap_mutation(cromossoma)
-    return cromossoma
+# Mutação Resetting Aleatória - Muda um enfermeiro aleatório da equipa, escolhendo só entre equipas válidas
+def random_resetting_mutation(population, mascara):
+    individuos, procedimentos = np.nonzero(mascara)
+    enfermeiro_idx = rng.integers(0, MAX_NURSES_PER_PROCEDURE, len(individuos))  # Um dos três enfermeiros
+    population[individuos, procedimentos] = tabela.random_neighbours(
+        procedimentos, population[individuos, procedimentos], enfermeiro_idx, rng)
 
 
-# Mutação Resetting Aleatória - Muda um enfermeiro aleatório da Tupla
-def random_resetting_mutation(procedure):
-    enfermeiros = list(procedure)
-    enfermeiro_idx = random.randint(0, MAX_NURSES_PER_PROCEDURE - 1)  # Escolhe aleatoriamente um dos três enfermeiros
-    while True:
-        new_enfermeiro = random.randint(0, NUM_NURSES - 1)
-        if new_enfermeiro != enfermeiros[enfermeiro_idx]:
-            enfermeiros[enfermeiro_idx] = new_enfermeiro
-            break
-    return tuple(enfermeiros)
+# Mutação Swap - Troca um enfermeiro entre duas equipas diferentes do cromossoma, uma vez por gene mutado
+def swap_mutation(population, mascara):
+    trocas = mascara.sum(axis=1)
+    for ronda in range(trocas.max(initial=0)):
+        individuos = np.flatnonzero(trocas > ronda)
 
+        # Seleciona duas equipas diferentes em cada indivíduo
+        idx1 = rng.integers(0, NUM_PROCEDURES, len(individuos))
+        idx2 = (idx1 + rng.integers(1, NUM_PROCEDURES, len(individuos))) % NUM_PROCEDURES
 
-# Mutação Swap - Troca dois enfermeiros aleatórios em posições diferentes do cromossoma
-def swap_mutation(cromossoma):
-    # Seleciona duas tuplas aleatórias
-    idx1, idx2 = random.sample(range(len(cromossoma)), 2)
+        # Troca os enfermeiros mantendo as equipas na forma canónica (ordenadas e sem repetidos)
+        population[individuos, idx1], population[individuos, idx2] = tabela.random_swaps(
+            population[individuos, idx1], population[individuos, idx2], rng)
 
-    # Seleciona uma posição aleatória dentro de cada tupla
-    pos1 = random.randint(0, len(cromossoma[idx1]) - 1)
-    pos2 = random.randint(0, len(cromossoma[idx2]) - 1)
 
-    # Troca os enfermeiros selecionados
-    cromossoma[idx1][pos1], cromossoma[idx2][pos2] = cromossoma[idx2][pos2], cromossoma[idx1][pos1]
+# Reparar só os filhos que violam alguma restrição
+def repair_population(population):
+    return construcao.repair_population(tabela, population, rng)
 
-    return cromossoma
 
+# Passo memético: hill-climbing com avaliação incremental sobre os MEMETIC_TOP_K melhores indivíduos
+# (substituir um enfermeiro, trocar enfermeiros no período e entre períodos)
+# Os ótimos locais já encontrados não voltam a ser melhorados (os filhos repetem muitas vezes os pais)
+def local_search(population, fitness_scores, durations):
+    for i in np.argsort(-fitness_scores, kind='stable')[:MEMETIC_TOP_K]:
+        if bytes(population[i]) in otimos_locais:
+            continue
+        avaliador = avaliacao.IncrementalEvaluator(combinacoes.decode(population[i]), tempos, **PENALTIES)
+        busca_local.hill_climb(avaliador, MEMETIC)
+        population[i] = combinacoes.encode(avaliador.solution())
+        fitness_scores[i], durations[i] = avaliador.fitness()
+        otimos_locais.add(bytes(population[i]))
+    return population, fitness_scores, durations
 
-# Inicializar a população aleatória
+
+# Inicializar a população com a amostragem construtiva (indivíduos já admissíveis).
+# A população é um único array uint8 (indivíduos x procedimentos) de índices de combinação.
 def initialize_population(size):
-    population = []
-    for _ in range(size):
-        individual = [
-            (random.randint(0, NUM_NURSES - 1), random.randint(0, NUM_NURSES - 1), random.randint(0, NUM_NURSES - 1))
-            for _ in range(NUM_PROCEDURES)]
-        population.append(individual)
-    return population
+    return np.array([construcao.construct(tabela) for _ in range(size)], dtype=np.uint8)
 
 
-# Atualização da população
-def evolve_population(population):
-    new_population = []
-    for _ in range(len(population) // 2):
-        parent1 = None
-        parent2 = None
-        child1 = None
-        child2 = None
-        # Selecionar os pais conforme o método de seleção
-        match SELECTION_TYPE:
-            case 'tournament':
-                parent1 = tournament_selection(population, TOURNAMENT_K)
-                parent2 = tournament_selection(population, TOURNAMENT_K)
-            case 'fitness-proportional':
-                parent1 = fitness_proportional_selection(population)
-                parent2 = fitness_proportional_selection(population)
-            case 'rank':
-                parent1 = rank_selection(population)
-                parent2 = rank_selection(population)
-            case 'random':
-                parent1 = random_selection(population)
-                parent2 = random_selection(population)
+# Atualização da população: seleção, crossover e mutação de toda a geração de uma vez
+def evolve_population(population, fitness_scores):
+    pares = len(population) // 2
+    with profiler.phase('selection'):
+        parents = select_parents(fitness_scores, 2 * pares).reshape(pares, 2)
+        parents1 = population[parents[:, 0]]
+        parents2 = population[parents[:, 1]]
 
+    with profiler.phase('crossover'):
         match CROSSOVER_TYPE:
             case 'multi-point':
-                child1, child2 = multi_point_crossover(parent1, parent2, CROSSOVER_POINT_K)
+                children1, children2 = multi_point_crossover(parents1, parents2, CROSSOVER_POINT_K)
             case 'uniform':
-                child1, child2 = uniform_crossover(parent1, parent2)
+                children1, children2 = uniform_crossover(parents1, parents2)
 
-        child1 = mutate(child1, MUTATION_RATE)
-        child2 = mutate(child2, MUTATION_RATE)
-        new_population.extend([child1, child2])
-    return new_population
-
-
-def genetic_algorithm():
-    population = initialize_population(POPULATION_SIZE - 1)
-    best_fitness_over_generations = []
-    best_duration_over_generations = []
+        # Filhos intercalados (filho 1 e filho 2 de cada par), como na versão por pares
+        new_population = np.stack((children1, children2), axis=1).reshape(-1, NUM_PROCEDURES)
 
-    # Inicializar as variáveis para a melhor solução global
-    global_best_fitness = float('-inf')
-    global_best_duration = None
-    global_best_solution = None
+    with profiler.phase('mutation'):
+        new_population = mutate(new_population, MUTATION_RATE)
+    if REPAIR:
+        with profiler.phase('repair'):
+            new_population = repair_population(new_population)
+    return new_population
 
-    for generation in range(GENERATIONS):
-        population = evolve_population(population)
-        for individual in population:
-            fitness, duration = evaluate_fitness(individual)
-            if fitness > global_best_fitness:
-                global_best_fitness = fitness
-                global_best_duration = duration
-                global_best_solution = individual
 
-        best_fitness_over_generations.append(global_best_fitness)
-        best_duration_over_generations.append(global_best_duration)
-        print(f'Geração {generation}: Melhor Fitness = {global_best_fitness}, Duração = {global_best_duration}')
+# Executa o AG até GENERATIONS gerações ou, com `time_budget` (segundos), até ao fim do prazo, parando mais
+# cedo se atingir o limite inferior. Devolve sempre a melhor solução encontrada até aí; as estatísticas da
+# execução ficam em `stats`. O progresso só é comunicado se for passado um `observer(generation, fitness,
+# duration)` (ex.: progresso.Throttle); sem observador a execução é silenciosa.
+def genetic_algorithm(time_budget=None, observer=None):
+    global profiler
+    if tabela is None:
+        load_instance()
+    if time_budget is None:
+        time_budget = TIME_BUDGET
+    # A instrumentação fica instalada só durante a execução: em caso de exceção (ex.: no observador) é
+    # parada e desinstalada na mesma, para o tracemalloc não continuar ligado
+    profiler = perfilador = perfil.Profiler(trace_memory=PROFILE_MEMORY) if PROFILE else perfil.DISABLED
+    perfilador.start()
+    try:
+        start = time.perf_counter()
+        prazo = None if time_budget is None else start + time_budget
+
+        cache.clear()
+        otimos_locais.clear()
+        with profiler.phase('initialization'):
+            population = initialize_population(POPULATION_SIZE - 1)
+        # A população anda acompanhada do seu fitness, calculado uma vez por indivíduo e por geração
+        with profiler.phase('evaluation'):
+            fitness_scores, durations = evaluate_population(population)
+        evaluations = len(population)
+        metricas = progresso.GenerationMetrics(GENERATIONS if prazo is None else 1024)
+
+        # A melhor solução global parte do melhor indivíduo inicial, para haver sempre uma solução a devolver
+        best = int(fitness_scores.argmax())
+        global_best_fitness = int(fitness_scores[best])
+        global_best_duration = int(durations[best])
+        global_best_solution = population[best].copy()
+
+        # Com prazo, o número de gerações deixa de contar
+        geracoes = range(GENERATIONS) if prazo is None else itertools.count()
+        stop_reason = 'generations'
+        generations_done = 0
+
+        for generation in geracoes:
+            if is_feasible(global_best_fitness, global_best_duration) and global_best_duration <= limite_inferior:
+                # A melhor solução admissível atinge o limite inferior (já não há melhor)
+                stop_reason = 'lower_bound'
+                break
+            if prazo is not None and time.perf_counter() >= prazo:
+                stop_reason = 'deadline'
+                break
+
+            population = evolve_population(population, fitness_scores)
+            with profiler.phase('evaluation'):
+                fitness_scores, durations = evaluate_population(population)
+            evaluations += len(population)
+            if MEMETIC:
+                with profiler.phase('local_search'):
+                    population, fitness_scores, durations = local_search(population, fitness_scores, durations)
+            with profiler.phase('bookkeeping'):
+                best = int(fitness_scores.argmax())
+                if fitness_scores[best] > global_best_fitness:
+                    global_best_fitness = int(fitness_scores[best])
+                    global_best_duration = int(durations[best])
+                    global_best_solution = population[best].copy()
+                generations_done = generation + 1
+                metricas.record(global_best_fitness, global_best_duration)
+
+            if observer is not None:
+                with profiler.phase('observer'):
+                    observer(generation, global_best_fitness, global_best_duration)
+
+        elapsed = time.perf_counter() - start
+    finally:
+        perfilador.stop()
+        profiler = perfil.DISABLED
+
+    stats.clear()
+    stats.update({
+        'generations': generations_done,
+        'evaluations': evaluations,
+        'elapsed': elapsed,
+        'evaluations_per_second': evaluations / elapsed,
+        'stop_reason': stop_reason,
+        'feasible': is_feasible(global_best_fitness, global_best_duration),
+        'best_fitness': metricas.best_fitness,
+        'best_duration': metricas.best_duration,
+        'cache': cache.stats(),
+    })
+    if perfilador.enabled:
+        perfilador.count('generations', generations_done)
+        perfilador.count('evaluations', evaluations)
+        stats['profile'] = perfilador.summary(cache=stats['cache'])
+        if PROFILE_FILE:
+            perfilador.export(PROFILE_FILE, cache=stats['cache'])
 
     return global_best_solution, global_best_fitness, global_best_duration
 
 
-# Executar o algoritmo genético
-best_solution, best_fitness, best_duration = genetic_algorithm()
-
-# Imprimir a melhor solução encontrada
-print('Melhor solução encontrada:')
-print(best_solution)
-print(f'Melhor Fitness: {best_fitness}, Duração Total: {best_duration}')
+if __name__ == '__main__':
+    # Executar o algoritmo genético
+    best_solution, best_fitness, best_duration = genetic_algorithm(
+        observer=progresso.Throttle(progresso.print_progress, every_generations=PROGRESS_EVERY))
+
+    # Imprimir a melhor solução encontrada
+    print('Melhor solução encontrada:')
+    print(combinacoes.decode(best_solution))
+    print(f'Melhor Fitness: {best_fitness}, Duração Total: {best_duration}')
+
+    # Distância ao ótimo que ainda pode existir
+    if stats['feasible']:
+        gap = best_duration - limite_inferior
+        print(f'Limite inferior: {limite_inferior}, gap de otimalidade: {gap} ({gap / limite_inferior:.2%})')
+    else:
+        print(f'Limite inferior: {limite_inferior}, nenhuma solução admissível encontrada')
+    print(f"{stats['generations']} gerações em {stats['elapsed']:.3f} s "
+          f"({stats['evaluations_per_second']:.0f} avaliações/s), paragem: {stats['stop_reason']}")
+    print(f'Cache de fitness: {cache.hits} acertos, {cache.misses} falhas, {cache.evictions} remoções')
+    if PROFILE:
+        for name, fase in stats['profile']['phases'].items():
+            print(f"  {name}: {fase['calls']} chamadas, {fase['seconds']:.3f} s ({fase['share']:.1%})")
@@ -0,0 +1,191 @@
+import importlib
+import json
+import os
+import random
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Espaço de procura: valores possíveis de cada constante do AG_final
+SPACE = {
+    'POPULATION_SIZE': (20, 30, 50, 80, 120),
+    'CROSSOVER_TYPE': ('multi-point', 'uniform'),
+    'CROSSOVER_POINT_K': (1, 2, 3, 5, 7),
+    'SELECTION_TYPE': ('tournament', 'fitness-proportional', 'rank', 'random'),
+    'TOURNAMENT_K': (2, 3, 4, 6, 8),
+    'MUTATION_TYPE': ('random_reseting', 'swap'),
+    'MUTATION_RATE': (0.02, 0.05, 0.1, 0.2, 0.3),
+}
+NUM_CONFIGURATIONS = 32  # Configurações sorteadas (além da atual do AG_final)
+TIME_BUDGET = 2.0  # Segundos por execução
+CENSORED_FACTOR = 2  # Execução que não atinge o alvo conta como CENSORED_FACTOR * TIME_BUDGET
+MIN_ROUNDS = 5  # Rondas (sementes) antes do primeiro teste
+MAX_ROUNDS = 30
+ALPHA = 0.05  # Nível de significância do teste de Friedman e das comparações a seguir
+WORKERS = os.cpu_count()  # Execuções em simultâneo: mais do que os CPUs faria as configurações disputarem o prazo
+RESULTS_FILE = 'afinacao.json'
+
+
+# Configurações a correr: a atual do AG_final e `count` sorteadas de SPACE (sem repetidas)
+def sample_configurations(count=NUM_CONFIGURATIONS, seed=None):
+    import AG_final
+
+    gerador = random.Random(seed)
+    configuracoes = [{name: getattr(AG_final, name) for name in SPACE}]
+    vistas = {tuple(configuracoes[0].values())}
+    for _ in range(100 * count):
+        if len(configuracoes) > count:
+            break
+        configuracao = {name: gerador.choice(valores) for name, valores in SPACE.items()}
+        if tuple(configuracao.values()) not in vistas:
+            vistas.add(tuple(configuracao.values()))
+            configuracoes.append(configuracao)
+    return configuracoes
+
+
+# Instância carregada uma vez em cada processo do pool (por _warm_up)
+_instancia = None
+
+
+# Preparação de cada processo do pool: carrega a instância e os módulos do solver e calcula a tabela e o
+# limite inferior, para que nenhuma execução conte a leitura dos dados nem a construção da tabela
+def _warm_up():
+    global _instancia
+    import solver
+
+    _instancia = solver.load_instance()
+    solver._table(_instancia)
+    for modulo in ('AG_final', 'combinacoes', 'exato', 'metaheuristicas', 'modelo'):
+        importlib.import_module(modulo)  # Os que solve() importa na primeira chamada
+
+
+# Uma execução (num processo do pool, já preparado por _warm_up): tempo até a melhor
+# solução admissível chegar a `target`, ou o valor censurado se o prazo acabar antes
+def _time_to_target(configuracao, seed, time_budget, target):
+    import AG_final
+    import solver
+
+    atingido = None
+    start = time.perf_counter()
+
+    def observer(generation, fitness, duration):
+        nonlocal atingido
+        if atingido is None and AG_final.is_feasible(fitness, duration) and duration <= target:
+            atingido = time.perf_counter() - start
+
+    solver.solve(_instancia, config={**configuracao, 'seed': seed, 'time_budget': time_budget, 'observer': observer})
+    return CENSORED_FACTOR * time_budget if atingido is None else atingido
+
+
+# Ranks de uma ronda (1 = mais rápida), com a média das posições nos empates
+def _ranks(valores):
+    ordem = sorted(range(len(valores)), key=valores.__getitem__)
+    ranks = [0.0] * len(valores)
+    i = 0
+    while i < len(ordem):
+        j = i
+        while j + 1 < len(ordem) and valores[ordem[j + 1]] == valores[ordem[i]]:
+            j += 1
+        for posicao in range(i, j + 1):
+            ranks[ordem[posicao]] = (i + j) / 2 + 1
+        i = j + 1
+    return ranks
+
+
+# Quantil do qui-quadrado pela aproximação de Wilson-Hilferty (sem depender do SciPy)
+def _chi2_quantile(p, df):
+    z = statistics.NormalDist().inv_cdf(p)
+    return df * (1 - 2 / (9 * df) + z * (2 / (9 * df)) ** 0.5) ** 3
+
+
+# Teste de Friedman (com correção para empates) sobre `tempos[i][j]` (ronda i, configuração j) e, se for
+# significativo, comparações com a melhor configuração (pós-teste de Conover, como na F-race). Devolve os
+# índices das configurações que ficam na corrida.
+def friedman_survivors(tempos, alpha=ALPHA):
+    n, k = len(tempos), len(tempos[0])
+    if k < 2:
+        return list(range(k))
+    ranks = [_ranks(ronda) for ronda in tempos]
+    somas = [sum(ronda[j] for ronda in ranks) for j in range(k)]
+    a = sum(r * r for ronda in ranks for r in ronda)
+    c = n * k * (k + 1) ** 2 / 4
+    if a == c:
+        return list(range(k))  # Todas empatadas em todas as rondas
+
+    estatistica = (k - 1) * sum((s - n * (k + 1) / 2) ** 2 for s in somas) / (a - c)
+    if estatistica <= _chi2_quantile(1 - alpha, k - 1):
+        return list(range(k))
+
+    # Com (n - 1)(k - 1) graus de liberdade o quantil t fica próximo do normal
+    critico = statistics.NormalDist().inv_cdf(1 - alpha / 2) * (
+        2 * n * (a - sum(s * s for s in somas) / n) / ((n - 1) * (k - 1))) ** 0.5
+    melhor = min(somas)
+    return [j for j in range(k) if somas[j] - melhor <= critico]
+
+
+# Corrida: em cada ronda, todas as configurações ainda em corrida correm com uma semente nova (em paralelo);
+# a partir de `min_rounds`, as que ficam significativamente atrás são eliminadas. Para com uma só
+# configuração ou ao fim de `max_rounds`, e escolhe a de menor tempo médio até ao alvo (por omissão, o
+# limite inferior da instância, que é o ótimo no enunciado).
+def race(configuracoes=None, time_budget=TIME_BUDGET, target=None, min_rounds=MIN_ROUNDS, max_rounds=MAX_ROUNDS,
+         alpha=ALPHA, workers=WORKERS, seed=0, observer=None):
+    import avaliacao
+    import combinacoes
+    import exato
+
+    if configuracoes is None:
+        configuracoes = sample_configurations(seed=seed)
+    if target is None:
+        target = exato.lower_bound(combinacoes.CombinationTable(avaliacao.load_durations()))
+
+    tempos = {j: [] for j in range(len(configuracoes))}
+    vivas = list(range(len(configuracoes)))
+    eliminadas = {}
+    execucoes = 0
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_warm_up) as executor:
+        for ronda in range(max_rounds):
+            if len(vivas) == 1:
+                break
+            semente = seed * max_rounds + ronda
+            futuros = {j: executor.submit(_time_to_target, configuracoes[j], semente, time_budget, target)
+                       for j in vivas}
+            for j, futuro in futuros.items():
+                tempos[j].append(futuro.result())
+            execucoes += len(futuros)
+
+            if ronda + 1 >= min_rounds:
+                ficam = friedman_survivors([[tempos[j][i] for j in vivas] for i in range(ronda + 1)], alpha)
+                for posicao, j in enumerate(vivas):
+                    if posicao not in ficam:
+                        eliminadas[j] = ronda + 1
+                vivas = [vivas[posicao] for posicao in ficam]
+            if observer is not None:
+                observer(ronda, len(vivas), execucoes)
+
+    media = {j: statistics.fmean(tempos[j]) for j in tempos}
+    melhor = min(vivas, key=media.__getitem__)
+    return {
+        'best': configuracoes[melhor],
+        'best_mean_time_to_target': media[melhor],
+        'target': target,
+        'survivors': [{'configuration': configuracoes[j], 'mean_time_to_target': media[j], 'runs': len(tempos[j])}
+                      for j in sorted(vivas, key=media.__getitem__)],
+        'eliminated': [{'configuration': configuracoes[j], 'round': ronda, 'mean_time_to_target': media[j]}
+                       for j, ronda in eliminadas.items()],
+        'runs': execucoes,
+        'elapsed': time.perf_counter() - start,
+    }
+
+
+if __name__ == '__main__':
+    resultado = race(observer=lambda ronda, vivas, execucoes: print(
+        f'Ronda {ronda + 1}: {vivas} configurações em corrida, {execucoes} execuções'))
+    with open(RESULTS_FILE, 'w') as f:
+        json.dump(resultado, f, indent=2)
+
+    print(f"Melhor configuração (tempo médio até {resultado['target']}: "
+          f"{resultado['best_mean_time_to_target']:.3f} s):")
+    for name, value in resultado['best'].items():
+        print(f'  {name} = {value!r}')
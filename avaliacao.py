@@ -0,0 +1,231 @@
+from collections import OrderedDict
+
+import numpy as np
+
+NUM_PROCEDURES = 14
+NUM_NURSES = 10
+MAX_NURSES_PER_PROCEDURE = 3
+MAX_PROCEDURES_PER_NURSE = 5
+
+# Pares de períodos conforme a restrição do enunciado
+period_pairs = [(0, 1), (2, 3), (4, 5), (6, 7), (8, 9), (10, 11), (12, 13)]
+
+# Enfermeiros da categoria 1
+enfermeiros_categoria_1 = {0, 1, 2, 3}
+
+# Procedimentos que não podem ser realizados por enfermeiros da categoria 1
+procedimentos_restritos = {2, 6, 7, 9, 11}
+
+# Índices e máscaras usados pelos kernels de avaliação
+_PROCEDURES = np.arange(NUM_PROCEDURES)[:, None]
+primeiro_do_periodo = np.array([p1 for p1, _ in period_pairs])
+segundo_do_periodo = np.array([p2 for _, p2 in period_pairs])
+mascara_categoria_1 = np.isin(np.arange(NUM_NURSES), list(enfermeiros_categoria_1))
+mascara_restritos = np.isin(np.arange(NUM_PROCEDURES), list(procedimentos_restritos))
+
+
+# Carregar a tabela de tempos para um array contíguo de inteiros (procedimento x enfermeiro), a partir da
+# cache binária do Excel (só relê o Excel quando este é modificado)
+def load_durations(file_path='Trab_Grupo.xlsx'):
+    import instancia
+
+    return instancia.load(file_path)['tempos']
+
+
+# Função de avaliação de fitness - lê apenas do array de tempos
+def evaluate_fitness(cromossoma, tempos, clash_penalty=1000, workload_penalty=250, category_penalty=1000,
+                     bonus_threshold=460, bonus=200, mismatch_penalty=0):
+    equipas = np.asarray(cromossoma)
+
+    # Duração de cada procedimento é o tempo do enfermeiro mais lento da equipa
+    duracoes = tempos[_PROCEDURES, equipas].max(axis=1)
+    total_duration = int(np.maximum(duracoes[primeiro_do_periodo], duracoes[segundo_do_periodo]).sum())
+
+    # Enfermeiros repetidos no mesmo período
+    periodos = np.sort(np.concatenate((equipas[primeiro_do_periodo], equipas[segundo_do_periodo]), axis=1), axis=1)
+    repetidos = np.count_nonzero((periodos[:, 1:] == periodos[:, :-1]).any(axis=1))
+
+    # Cada participação acima das 5 permitidas é penalizada
+    carga = np.bincount(equipas.ravel(), minlength=NUM_NURSES)
+    excesso = int(np.maximum(carga - MAX_PROCEDURES_PER_NURSE, 0).sum())
+
+    # Enfermeiros da categoria 1 em procedimentos restritos
+    categoria = np.count_nonzero(mascara_categoria_1[equipas].any(axis=1) & mascara_restritos)
+
+    fitness = (total_duration + clash_penalty * repetidos + workload_penalty * excesso
+               + category_penalty * categoria)
+
+    # Bônus para soluções abaixo do limiar
+    if fitness < bonus_threshold:
+        fitness -= bonus
+
+    # Penalidade extra sempre que o fitness (depois do bônus) não coincide com a duração (AG Monteiro)
+    if fitness != total_duration:
+        fitness += mismatch_penalty
+
+    return -fitness, total_duration  # Queremos minimizar a duração total com penalidades
+
+
+# Avaliação vetorizada de toda a população (array inteiro com forma (população, procedimentos, enfermeiros))
+def evaluate_population(populacao, tempos, clash_penalty=1000, workload_penalty=250, category_penalty=1000,
+                        bonus_threshold=460, bonus=200, mismatch_penalty=0):
+    equipas = np.asarray(populacao)
+    size = equipas.shape[0]
+
+    # Duração de cada procedimento é o tempo do enfermeiro mais lento da equipa
+    duracoes = tempos[_PROCEDURES, equipas].max(axis=2)
+    total_duration = np.maximum(duracoes[:, primeiro_do_periodo], duracoes[:, segundo_do_periodo]).sum(axis=1)
+
+    # Enfermeiros repetidos no mesmo período
+    periodos = np.sort(np.concatenate((equipas[:, primeiro_do_periodo], equipas[:, segundo_do_periodo]), axis=2), axis=2)
+    repetidos = (periodos[:, :, 1:] == periodos[:, :, :-1]).any(axis=2).sum(axis=1)
+
+    # Cada participação acima das 5 permitidas é penalizada (contagem por indivíduo num único bincount)
+    deslocamento = (np.arange(size) * NUM_NURSES)[:, None, None]
+    carga = np.bincount((equipas + deslocamento).ravel(), minlength=size * NUM_NURSES).reshape(size, NUM_NURSES)
+    excesso = np.maximum(carga - MAX_PROCEDURES_PER_NURSE, 0).sum(axis=1)
+
+    # Enfermeiros da categoria 1 em procedimentos restritos
+    categoria = (mascara_categoria_1[equipas].any(axis=2) & mascara_restritos).sum(axis=1)
+
+    fitness = (total_duration + clash_penalty * repetidos + workload_penalty * excesso
+               + category_penalty * categoria)
+
+    # Bônus para soluções abaixo do limiar
+    fitness = np.where(fitness < bonus_threshold, fitness - bonus, fitness)
+    fitness = fitness + mismatch_penalty * (fitness != total_duration)
+
+    return -fitness, total_duration
+
+
+# Avaliação incremental: guarda as durações por período e a carga por enfermeiro, e atualiza-as em O(1)
+# a cada troca de um enfermeiro. Comporta-se como o cromossoma (lista de tuplas), pelo que os operadores
+# de mutação podem ser aplicados diretamente sobre ela.
+class IncrementalEvaluator:
+    def __init__(self, cromossoma, tempos, clash_penalty=1000, workload_penalty=250, category_penalty=1000,
+                 bonus_threshold=460, bonus=200, mismatch_penalty=0):
+        self.tempos = tempos.tolist()
+        self.clash_penalty = clash_penalty
+        self.workload_penalty = workload_penalty
+        self.category_penalty = category_penalty
+        self.bonus_threshold = bonus_threshold
+        self.bonus = bonus
+        self.mismatch_penalty = mismatch_penalty
+
+        self.equipas = [list(procedimento) for procedimento in cromossoma]
+        self.period_of = [0] * len(self.equipas)
+        self.partner = [0] * len(self.equipas)
+        for k, (p1, p2) in enumerate(period_pairs):
+            self.period_of[p1], self.partner[p1] = k, p2
+            self.period_of[p2], self.partner[p2] = k, p1
+
+        self.duracoes = [max(self.tempos[i][e] for e in equipa) for i, equipa in enumerate(self.equipas)]
+        self.period_durations = [max(self.duracoes[p1], self.duracoes[p2]) for p1, p2 in period_pairs]
+        self.total_duration = sum(self.period_durations)
+
+        self.clashes = [len(set(self.equipas[p1] + self.equipas[p2])) != 6 for p1, p2 in period_pairs]
+        self.repetidos = sum(self.clashes)
+
+        self.carga = [0] * NUM_NURSES
+        for equipa in self.equipas:
+            for enfermeiro in equipa:
+                self.carga[enfermeiro] += 1
+        self.excesso = sum(max(c - MAX_PROCEDURES_PER_NURSE, 0) for c in self.carga)
+
+        self.violacoes = [i in procedimentos_restritos and any(e in enfermeiros_categoria_1 for e in equipa)
+                          for i, equipa in enumerate(self.equipas)]
+        self.categoria = sum(self.violacoes)
+
+    # Troca o enfermeiro na posição `slot` do procedimento `procedure` e atualiza apenas os termos afetados
+    def set_nurse(self, procedure, slot, enfermeiro):
+        equipa = self.equipas[procedure]
+        antigo = equipa[slot]
+        if antigo == enfermeiro:
+            return
+
+        # Carga dos dois enfermeiros envolvidos
+        if self.carga[antigo] > MAX_PROCEDURES_PER_NURSE:
+            self.excesso -= 1
+        self.carga[antigo] -= 1
+        self.carga[enfermeiro] += 1
+        if self.carga[enfermeiro] > MAX_PROCEDURES_PER_NURSE:
+            self.excesso += 1
+        equipa[slot] = enfermeiro
+
+        # Duração do procedimento e do seu período
+        linha = self.tempos[procedure]
+        self.duracoes[procedure] = max(linha[e] for e in equipa)
+        periodo = self.period_of[procedure]
+        parceiro = self.partner[procedure]
+        duracao = max(self.duracoes[procedure], self.duracoes[parceiro])
+        self.total_duration += duracao - self.period_durations[periodo]
+        self.period_durations[periodo] = duracao
+
+        # Enfermeiros repetidos no período
+        repetido = len(set(equipa + self.equipas[parceiro])) != 6
+        self.repetidos += repetido - self.clashes[periodo]
+        self.clashes[periodo] = repetido
+
+        # Categoria 1 em procedimento restrito
+        if procedure in procedimentos_restritos:
+            violacao = any(e in enfermeiros_categoria_1 for e in equipa)
+            self.categoria += violacao - self.violacoes[procedure]
+            self.violacoes[procedure] = violacao
+
+    # Mesmo resultado que evaluate_fitness para o cromossoma atual
+    def fitness(self):
+        fitness = (self.total_duration + self.clash_penalty * self.repetidos
+                   + self.workload_penalty * self.excesso + self.category_penalty * self.categoria)
+        if fitness < self.bonus_threshold:
+            fitness -= self.bonus
+        if fitness != self.total_duration:
+            fitness += self.mismatch_penalty
+        return -fitness, self.total_duration
+
+    def solution(self):
+        return [tuple(equipa) for equipa in self.equipas]
+
+    def __len__(self):
+        return len(self.equipas)
+
+    def __getitem__(self, procedure):
+        return tuple(self.equipas[procedure])
+
+    def __setitem__(self, procedure, equipa):
+        for slot, enfermeiro in enumerate(equipa):
+            self.set_nurse(procedure, slot, enfermeiro)
+
+
+# Cache LRU limitada de resultados de fitness, indexada pela codificação do cromossoma (ex.: bytes dos genes)
+class FitnessCache:
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._dados = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        resultado = self._dados.get(key)
+        if resultado is None:
+            self.misses += 1
+            return None
+        self._dados.move_to_end(key)
+        self.hits += 1
+        return resultado
+
+    def put(self, key, resultado):
+        self._dados[key] = resultado
+        self._dados.move_to_end(key)
+        if len(self._dados) > self.maxsize:
+            self._dados.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._dados.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions, 'size': len(self._dados)}
@@ -0,0 +1,106 @@
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+import avaliacao
+
+CHUNK_SIZE = None  # Indivíduos por tarefa; None: um bloco por worker (blocos pequenos gastam o tempo em IPC)
+MIN_CHUNK_SIZE = 64  # Com CHUNK_SIZE None, blocos nunca menores do que isto (só conta em populações muito pequenas)
+
+# Estado de cada worker: vista sobre a memória partilhada e tabela de combinações (criada quando necessária)
+_shm = None
+_tempos = None
+_tabela = None
+_penalidades = {}
+
+
+# Inicialização do worker: liga-se à matriz de tempos publicada em memória partilhada,
+# sem voltar a ler o Excel
+def _init_worker(name, shape, dtype, penalidades):
+    global _shm, _tempos, _penalidades
+    _shm = shared_memory.SharedMemory(name=name)
+    _tempos = np.ndarray(shape, dtype=dtype, buffer=_shm.buf)
+    _penalidades = penalidades
+
+
+# Avaliação de um bloco: (n, 14, 3) enfermeiros por equipa ou (n, 14) índices de combinação
+def _evaluate_chunk(chunk):
+    global _tabela
+    if chunk.ndim == 2:
+        if _tabela is None:
+            import combinacoes
+            _tabela = combinacoes.CombinationTable(_tempos)
+        return _tabela.evaluate_population(chunk, **_penalidades)
+    return avaliacao.evaluate_population(chunk, _tempos, **_penalidades)
+
+
+# Avaliação da população num conjunto de processos. A matriz de tempos é publicada uma única vez em
+# memória partilhada e a população é enviada em blocos de arrays uint8 compactos.
+class ParallelEvaluator:
+    def __init__(self, tempos, max_workers=None, chunk_size=CHUNK_SIZE, **penalidades):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self._shm = shared_memory.SharedMemory(create=True, size=tempos.nbytes)
+        partilhado = np.ndarray(tempos.shape, dtype=tempos.dtype, buffer=self._shm.buf)
+        partilhado[:] = tempos
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers, initializer=_init_worker,
+            initargs=(self._shm.name, tempos.shape, tempos.dtype.str, penalidades))
+
+    def evaluate_population(self, population):
+        populacao = np.asarray(population, dtype=np.uint8)
+        tamanho = self.chunk_size or max(math.ceil(len(populacao) / self.max_workers), MIN_CHUNK_SIZE)
+        chunks = [populacao[i:i + tamanho] for i in range(0, len(populacao), tamanho)]
+        resultados = list(self._executor.map(_evaluate_chunk, chunks))
+        fitness = np.concatenate([f for f, _ in resultados])
+        durations = np.concatenate([d for _, d in resultados])
+        return fitness, durations
+
+    def close(self):
+        self._executor.shutdown()
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Comparação com a avaliação num único processo para vários tamanhos de população, com o tamanho de
+# bloco por omissão (um por worker); o ganho ideal é o número de workers
+def benchmark(tempos, sizes=(500, 2000, 4000, 10000, 50000), repeats=5, **opcoes):
+    import combinacoes
+    tabela = combinacoes.CombinationTable(tempos)
+    rng = np.random.default_rng(0)
+
+    with ParallelEvaluator(tempos, **opcoes) as paralelo:
+        print(f'{paralelo.max_workers} workers, blocos de '
+              f"{paralelo.chunk_size or f'max(n / workers, {MIN_CHUNK_SIZE})'} indivíduos")
+        # Aquecer os workers (arranque e tabela de combinações) com um bloco pequeno para cada um
+        amostra = rng.integers(0, len(combinacoes.COMBINACOES), (10, avaliacao.NUM_PROCEDURES), dtype=np.uint8)
+        list(paralelo._executor.map(_evaluate_chunk, [amostra] * paralelo.max_workers))
+        for size in sizes:
+            populacao = rng.integers(0, len(combinacoes.COMBINACOES), (size, avaliacao.NUM_PROCEDURES), dtype=np.uint8)
+
+            inicio = time.perf_counter()
+            for _ in range(repeats):
+                tabela.evaluate_population(populacao)
+            sequencial = (time.perf_counter() - inicio) / repeats
+
+            inicio = time.perf_counter()
+            for _ in range(repeats):
+                paralelo.evaluate_population(populacao)
+            paralela = (time.perf_counter() - inicio) / repeats
+
+            print(f'População {size}: 1 processo {size / sequencial:.0f} aval/s, '
+                  f'conjunto de processos {size / paralela:.0f} aval/s (ganho {sequencial / paralela:.2f}x)')
+
+
+if __name__ == '__main__':
+    benchmark(avaliacao.load_durations())
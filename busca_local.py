@@ -0,0 +1,101 @@
+import random
+
+from avaliacao import NUM_PROCEDURES, NUM_NURSES, MAX_NURSES_PER_PROCEDURE, period_pairs
+
+# Vizinhanças disponíveis:
+# - 'replace': trocar um enfermeiro de uma equipa por outro que não esteja na equipa
+# - 'period_swap': trocar um enfermeiro entre os dois procedimentos do mesmo período
+# - 'cross_swap': trocar um enfermeiro entre procedimentos de períodos diferentes (a carga não muda)
+MOVES = ('replace', 'period_swap', 'cross_swap')
+
+_PERIODO = {procedure: k for k, par in enumerate(period_pairs) for procedure in par}
+_PARCEIRO = {p1: p2 for par in period_pairs for p1, p2 in (par, par[::-1])}
+_OUTROS_PERIODOS = [[q for q in range(NUM_PROCEDURES) if _PERIODO[q] != _PERIODO[p]] for p in range(NUM_PROCEDURES)]
+
+
+# Movimentos de uma vizinhança, cada um como a lista de alterações (procedimento, posição, enfermeiro).
+# Só gera movimentos que não repetem enfermeiros dentro de uma equipa.
+def neighbourhood(avaliador, moves=MOVES):
+    equipas = avaliador.equipas
+    if 'replace' in moves:
+        for procedure, equipa in enumerate(equipas):
+            for slot in range(MAX_NURSES_PER_PROCEDURE):
+                for enfermeiro in range(NUM_NURSES):
+                    if enfermeiro not in equipa:
+                        yield [(procedure, slot, enfermeiro)]
+
+    if 'period_swap' in moves or 'cross_swap' in moves:
+        for p in range(NUM_PROCEDURES):
+            for q in range(p + 1, NUM_PROCEDURES):
+                mesmo_periodo = _PERIODO[p] == _PERIODO[q]
+                if ('period_swap' if mesmo_periodo else 'cross_swap') not in moves:
+                    continue
+                for i, a in enumerate(equipas[p]):
+                    if a in equipas[q]:
+                        continue
+                    for j, b in enumerate(equipas[q]):
+                        if b not in equipas[p]:
+                            yield [(p, i, b), (q, j, a)]
+
+
+# Um movimento aleatório de uma das vizinhanças, sorteado em O(1) (os sorteios inválidos são repetidos)
+def random_move(avaliador, moves=MOVES):
+    equipas = avaliador.equipas
+    while True:
+        tipo = random.choice(moves)
+        p = random.randrange(NUM_PROCEDURES)
+        i = random.randrange(MAX_NURSES_PER_PROCEDURE)
+        if tipo == 'replace':
+            enfermeiro = random.randrange(NUM_NURSES)
+            if enfermeiro not in equipas[p]:
+                return [(p, i, enfermeiro)]
+            continue
+
+        q = _PARCEIRO[p] if tipo == 'period_swap' else random.choice(_OUTROS_PERIODOS[p])
+        j = random.randrange(MAX_NURSES_PER_PROCEDURE)
+        a, b = equipas[p][i], equipas[q][j]
+        if a not in equipas[q] and b not in equipas[p]:
+            return [(p, i, b), (q, j, a)]
+
+
+# Aplica um movimento e devolve as alterações que o desfazem
+def apply_move(avaliador, movimento):
+    desfazer = [(procedure, slot, avaliador.equipas[procedure][slot]) for procedure, slot, _ in reversed(movimento)]
+    for procedure, slot, enfermeiro in movimento:
+        avaliador.set_nurse(procedure, slot, enfermeiro)
+    return desfazer
+
+
+# Hill-climbing sobre um IncrementalEvaluator: cada movimento é avaliado em O(1) (aplicar, ler o fitness,
+# desfazer). 'first' aceita o primeiro movimento que melhora (vizinhança em ordem aleatória); 'best'
+# percorre a vizinhança toda e aplica o melhor. Para num ótimo local ou ao fim de `max_steps` melhorias.
+# Devolve o número de movimentos avaliados.
+def hill_climb(avaliador, strategy='first', moves=MOVES, max_steps=None):
+    evaluations = 0
+    steps = 0
+    atual = avaliador.fitness()[0]
+
+    while max_steps is None or steps < max_steps:
+        vizinhanca = list(neighbourhood(avaliador, moves))
+        if strategy == 'first':
+            random.shuffle(vizinhanca)
+
+        melhor, melhor_movimento = atual, None
+        for movimento in vizinhanca:
+            desfazer = apply_move(avaliador, movimento)
+            fitness = avaliador.fitness()[0]
+            apply_move(avaliador, desfazer)
+            evaluations += 1
+
+            if fitness > melhor:
+                melhor, melhor_movimento = fitness, movimento
+                if strategy == 'first':
+                    break
+
+        if melhor_movimento is None:
+            break  # Ótimo local
+        apply_move(avaliador, melhor_movimento)
+        atual = melhor
+        steps += 1
+
+    return evaluations
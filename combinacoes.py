@@ -0,0 +1,202 @@
+import itertools
+import random
+
+import numpy as np
+
+from avaliacao import NUM_PROCEDURES, NUM_NURSES, MAX_NURSES_PER_PROCEDURE, MAX_PROCEDURES_PER_NURSE, \
+    mascara_categoria_1, mascara_restritos, primeiro_do_periodo, segundo_do_periodo
+
+# Tempo usado no Excel para indicar que o enfermeiro não pode realizar o procedimento
+SENTINELA = 999
+
+_PROCEDIMENTOS = np.arange(NUM_PROCEDURES)
+
+# Representação canónica das equipas: enfermeiros distintos por ordem crescente.
+# (2, 3, 5) e (5, 3, 2) são a mesma equipa, por isso só existem C(10, 3) = 120 genes possíveis.
+COMBINACOES = list(itertools.combinations(range(NUM_NURSES), MAX_NURSES_PER_PROCEDURE))
+
+
+# Forma canónica de uma equipa
+def canonical(equipa):
+    return tuple(sorted(equipa))
+
+
+# Equipa canónica aleatória (3 enfermeiros distintos)
+def random_team():
+    return tuple(sorted(random.sample(range(NUM_NURSES), MAX_NURSES_PER_PROCEDURE)))
+
+
+# Substitui o enfermeiro da posição `slot` por um que ainda não esteja na equipa
+def replace_nurse(equipa, slot):
+    enfermeiros = list(equipa)
+    enfermeiros[slot] = random.choice([e for e in range(NUM_NURSES) if e not in equipa])
+    return tuple(sorted(enfermeiros))
+
+
+# Troca um enfermeiro entre duas equipas, escolhendo apenas enfermeiros que não existam já na outra equipa
+def swap_nurses(equipa1, equipa2):
+    candidatos1 = [e for e in equipa1 if e not in equipa2]
+    candidatos2 = [e for e in equipa2 if e not in equipa1]
+    if not candidatos1:
+        return equipa1, equipa2  # Equipas iguais: não há troca possível
+
+    enfermeiro1 = random.choice(candidatos1)
+    enfermeiro2 = random.choice(candidatos2)
+    novo1 = [enfermeiro2 if e == enfermeiro1 else e for e in equipa1]
+    novo2 = [enfermeiro1 if e == enfermeiro2 else e for e in equipa2]
+    return tuple(sorted(novo1)), tuple(sorted(novo2))
+
+
+# Codificar / descodificar cromossomas entre equipas (tuplas) e índices de combinação
+INDICES = {equipa: i for i, equipa in enumerate(COMBINACOES)}
+
+
+def encode(cromossoma):
+    return [INDICES[canonical(equipa)] for equipa in cromossoma]
+
+
+def decode(cromossoma):
+    return [COMBINACOES[i] for i in cromossoma]
+
+
+# Tabela pré-calculada (procedimento x combinação) com a duração da equipa e a sua validade.
+# Permite avaliar, inicializar e mutar cromossomas de índices de combinação com leituras de array.
+class CombinationTable:
+    def __init__(self, tempos):
+        self.equipas = np.array(COMBINACOES)
+        tempos_equipa = tempos[:, self.equipas]  # (procedimentos, combinações, enfermeiros)
+
+        # Duração da equipa em cada procedimento: tempo do enfermeiro mais lento
+        self.duracoes = np.ascontiguousarray(tempos_equipa.max(axis=2))
+
+        # Validade por categoria (categoria 1 em procedimentos restritos) e pelo sentinela 999
+        categoria_1 = mascara_categoria_1[self.equipas].any(axis=1)
+        self.valida_categoria = ~(mascara_restritos[:, None] & categoria_1[None, :])
+        self.valida_sentinela = (tempos_equipa != SENTINELA).all(axis=2)
+        self.valida = self.valida_categoria & self.valida_sentinela
+
+        # Enfermeiros que podem realizar cada procedimento (usado na reparação)
+        self.pode = (tempos != SENTINELA) & ~(mascara_restritos[:, None] & mascara_categoria_1[None, :])
+
+        # Pertença de cada enfermeiro a cada combinação e pares de combinações sem enfermeiros em comum
+        self.membros = np.zeros((len(COMBINACOES), NUM_NURSES), dtype=np.int32)
+        np.put_along_axis(self.membros, self.equipas, 1, axis=1)
+        self.disjuntas = (self.membros @ self.membros.T) == 0
+        self.vizinhas = (self.membros @ self.membros.T) == MAX_NURSES_PER_PROCEDURE - 1  # Diferem num enfermeiro
+        self.bits = (1 << self.equipas).sum(axis=1)  # Enfermeiros de cada combinação como máscara de bits
+
+        # Combinações válidas por procedimento (para amostragem) e vizinhos válidos (um enfermeiro diferente)
+        self.validas = [np.flatnonzero(linha).tolist() for linha in self.valida]
+        self.vizinhos = [[self._neighbours(procedure, i) for i in range(len(COMBINACOES))]
+                         for procedure in range(NUM_PROCEDURES)]
+
+        # Os mesmos vizinhos num array (procedimento, combinação, posição, vizinho) para a mutação vetorizada
+        self.num_vizinhos = np.array([[[len(v) for v in por_posicao] for por_posicao in linha]
+                                      for linha in self.vizinhos])
+        self.tabela_vizinhos = np.zeros(self.num_vizinhos.shape + (NUM_NURSES - MAX_NURSES_PER_PROCEDURE,),
+                                        dtype=np.uint8)
+        for procedure, linha in enumerate(self.vizinhos):
+            for combinacao, por_posicao in enumerate(linha):
+                for slot, validos in enumerate(por_posicao):
+                    self.tabela_vizinhos[procedure, combinacao, slot, :len(validos)] = validos
+
+        # Resultado de trocar um enfermeiro entre duas equipas (a, b): até 3 x 3 trocas possíveis,
+        # com as trocas válidas (enfermeiros que não existam já na outra equipa) primeiro
+        self.trocas, self.num_trocas = self._swaps()
+
+    def _swaps(self):
+        bits = self.bits
+        indice_por_bits = np.zeros(1 << NUM_NURSES, dtype=np.uint8)
+        indice_por_bits[bits] = np.arange(len(COMBINACOES))
+
+        a = np.arange(len(COMBINACOES))[:, None, None, None]
+        b = np.arange(len(COMBINACOES))[None, :, None, None]
+        x = self.equipas[a, np.arange(MAX_NURSES_PER_PROCEDURE)[None, None, :, None]]  # Sai de a, entra em b
+        y = self.equipas[b, np.arange(MAX_NURSES_PER_PROCEDURE)[None, None, None, :]]  # Sai de b, entra em a
+        valida = (self.membros[b, x] == 0) & (self.membros[a, y] == 0)
+
+        novo_a = indice_por_bits[(bits[a] & ~(1 << x)) | (1 << y)]
+        novo_b = indice_por_bits[(bits[b] & ~(1 << y)) | (1 << x)]
+
+        forma = (len(COMBINACOES), len(COMBINACOES), MAX_NURSES_PER_PROCEDURE ** 2)
+        valida = np.broadcast_to(valida, forma[:2] + (MAX_NURSES_PER_PROCEDURE,) * 2).reshape(forma)
+        ordem = np.argsort(~valida, axis=2, kind='stable')
+        trocas = np.stack((np.take_along_axis(novo_a.reshape(forma), ordem, axis=2),
+                           np.take_along_axis(novo_b.reshape(forma), ordem, axis=2)), axis=-1)
+        return trocas, valida.sum(axis=2)
+
+    def _neighbours(self, procedure, combinacao):
+        equipa = COMBINACOES[combinacao]
+        vizinhos = []
+        for slot in range(MAX_NURSES_PER_PROCEDURE):
+            validos = []
+            for enfermeiro in range(NUM_NURSES):
+                if enfermeiro not in equipa:
+                    novo = INDICES[canonical(equipa[:slot] + (enfermeiro,) + equipa[slot + 1:])]
+                    if self.valida[procedure, novo]:
+                        validos.append(novo)
+            vizinhos.append(validos)
+        return vizinhos
+
+    # Combinação válida aleatória para o procedimento
+    def random_team(self, procedure):
+        return random.choice(self.validas[procedure])
+
+    # Substitui o enfermeiro da posição `slot` por outro, escolhendo só entre combinações válidas
+    def replace_nurse(self, procedure, combinacao, slot):
+        validos = self.vizinhos[procedure][combinacao][slot]
+        return random.choice(validos) if validos else combinacao
+
+    # Versão vetorizada de replace_nurse para arrays de procedimentos, combinações e posições
+    def random_neighbours(self, procedures, combinacoes, slots, rng):
+        contagem = self.num_vizinhos[procedures, combinacoes, slots]
+        escolha = (rng.random(len(contagem)) * contagem).astype(np.intp)
+        novos = self.tabela_vizinhos[procedures, combinacoes, slots, np.minimum(escolha, self.tabela_vizinhos.shape[-1] - 1)]
+        return np.where(contagem > 0, novos, combinacoes)
+
+    # Troca aleatória de um enfermeiro entre os pares de equipas (a, b); equipas iguais ficam como estão
+    def random_swaps(self, a, b, rng):
+        contagem = self.num_trocas[a, b]
+        escolha = np.minimum((rng.random(len(contagem)) * contagem).astype(np.intp), self.trocas.shape[2] - 1)
+        novo_a, novo_b = self.trocas[a, b, escolha].T
+        return np.where(contagem > 0, novo_a, a), np.where(contagem > 0, novo_b, b)
+
+    # Avaliação de um cromossoma de índices de combinação
+    def evaluate(self, cromossoma, **penalidades):
+        fitness, total_duration = self.evaluate_population([cromossoma], **penalidades)
+        return int(fitness[0]), int(total_duration[0])
+
+    # Termos da avaliação para uma população de índices de combinação (população x procedimentos):
+    # duração total, períodos com repetidos, participações acima de 5 e violações de categoria
+    def terms(self, populacao):
+        ids = np.asarray(populacao)
+
+        duracoes = self.duracoes[_PROCEDIMENTOS, ids]
+        total_duration = np.maximum(duracoes[:, primeiro_do_periodo], duracoes[:, segundo_do_periodo]).sum(axis=1)
+
+        repetidos = (~self.disjuntas[ids[:, primeiro_do_periodo], ids[:, segundo_do_periodo]]).sum(axis=1)
+
+        carga = self.membros[ids].sum(axis=1)
+        excesso = np.maximum(carga - MAX_PROCEDURES_PER_NURSE, 0).sum(axis=1)
+
+        categoria = (~self.valida_categoria[_PROCEDIMENTOS, ids]).sum(axis=1)
+
+        return total_duration, repetidos, excesso, categoria
+
+    # Indivíduos que violam alguma restrição (incluindo equipas com tempos 999)
+    def violations(self, populacao):
+        ids = np.asarray(populacao)
+        _, repetidos, excesso, _ = self.terms(ids)
+        return (repetidos > 0) | (excesso > 0) | ~self.valida[_PROCEDIMENTOS, ids].all(axis=1)
+
+    # Avaliação vetorizada de uma população de índices de combinação (população x procedimentos)
+    def evaluate_population(self, populacao, clash_penalty=1000, workload_penalty=250, category_penalty=1000,
+                            bonus_threshold=460, bonus=200, mismatch_penalty=0):
+        total_duration, repetidos, excesso, categoria = self.terms(populacao)
+
+        fitness = (total_duration + clash_penalty * repetidos + workload_penalty * excesso
+                   + category_penalty * categoria)
+        fitness = np.where(fitness < bonus_threshold, fitness - bonus, fitness)
+        fitness = fitness + mismatch_penalty * (fitness != total_duration)
+
+        return -fitness, total_duration
@@ -0,0 +1,202 @@
+import importlib.util
+import json
+import os
+import platform
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Variantes do AG a comparar: nome -> ficheiro (o 'AG Monteiro.py' tem um espaço no nome e não se importa
+# com import, por isso todas são carregadas pelo caminho)
+VARIANTS = {
+    'AG': 'AG.py',
+    'AG_final': 'AG_final.py',
+    'AG_Alex': 'AG_Alex.py',
+    'AG Monteiro': 'AG Monteiro.py',
+}
+SEEDS = tuple(range(10))
+TIME_BUDGET = 10.0  # Segundos de AG por execução, iguais para todas as variantes
+# Durações alvo para o tempo até ao alvo. O ótimo provado pelo solver exato (447 no enunciado) é sempre
+# acrescentado, porque 420 fica abaixo dele e nenhuma variante o atinge.
+TARGET_DURATIONS = (420,)
+MAX_GENERATIONS = 10 ** 6  # Gerações das variantes sem prazo próprio: é o prazo que as para
+WORKERS = os.cpu_count()  # Execuções em simultâneo: mais do que os CPUs faria as variantes disputarem o prazo
+RESULTS_FILE = 'comparacao_variantes.json'
+
+
+class _Deadline(Exception):
+    pass
+
+
+def _load(variant):
+    nome = variant.replace(' ', '_')
+    spec = importlib.util.spec_from_file_location(nome, os.path.join(os.path.dirname(__file__), VARIANTS[variant]))
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    modulo.load_instance()
+    return modulo
+
+
+# Uma execução de uma variante, num processo novo (módulo e geradores aleatórios limpos). O carregamento
+# do módulo (Excel, tabela, solver exato do AG_Alex) fica fora do tempo medido.
+# - O AG_final tem prazo próprio e conta as suas avaliações; a admissibilidade vem de is_feasible.
+# - Nas restantes, o prazo é imposto pelo observador (chamado a cada geração), e evaluate_fitness do módulo
+#   é embrulhada para contar as chamadas (incluindo as repetidas para o mesmo indivíduo, que também
+#   custam tempo). Como cada variante tem os seus pesos e bônus, a admissibilidade de um indivíduo é
+#   confirmada com os pesos sem bônus, só quando a sua duração melhora a melhor admissível.
+def _run(variant, seed, time_budget, targets):
+    import avaliacao
+
+    random.seed(seed)
+    modulo = _load(variant)
+    alvos = sorted(targets)
+    resultado = {'time_to_feasible': None, 'time_to_target': {alvo: None for alvo in alvos}, 'duration': None}
+    start = None
+
+    def admissible(duration):
+        agora = time.perf_counter() - start
+        if resultado['time_to_feasible'] is None:
+            resultado['time_to_feasible'] = agora
+        resultado['duration'] = duration
+        for alvo in alvos:
+            if duration <= alvo and resultado['time_to_target'][alvo] is None:
+                resultado['time_to_target'][alvo] = agora
+
+    if variant == 'AG_final':
+        modulo.rng = np.random.default_rng(seed)
+
+        def observer(generation, fitness, duration):
+            if modulo.is_feasible(fitness, duration) and (resultado['duration'] is None or
+                                                          duration < resultado['duration']):
+                admissible(duration)
+
+        modulo.GENERATIONS = MAX_GENERATIONS
+        start = time.perf_counter()
+        modulo.genetic_algorithm(time_budget=time_budget, observer=observer)
+        elapsed = time.perf_counter() - start
+        evaluations = modulo.stats['evaluations']
+        generations = modulo.stats['generations']
+        stop_reason = modulo.stats['stop_reason']
+    else:
+        original = modulo.evaluate_fitness
+        evaluations = generations = 0
+
+        def evaluate_fitness(cromossoma):
+            nonlocal evaluations
+            evaluations += 1
+            fitness, duration = original(cromossoma)
+            if resultado['duration'] is None or duration < resultado['duration']:
+                penalizado, _ = avaliacao.evaluate_fitness(cromossoma, modulo.tempos, workload_penalty=1000, bonus=0)
+                if -penalizado == duration:
+                    admissible(duration)
+            return fitness, duration
+
+        def observer(generation, fitness, duration):
+            nonlocal generations
+            generations = generation + 1
+            if time.perf_counter() - start >= time_budget:
+                raise _Deadline
+
+        modulo.evaluate_fitness = evaluate_fitness
+        modulo.GENERATIONS = MAX_GENERATIONS
+        start = time.perf_counter()
+        try:
+            _, _, duracao = modulo.genetic_algorithm(observer=observer)[:3]
+            alvo = getattr(modulo, 'TARGET_DURATION', None)
+            stop_reason = 'target' if alvo is not None and duracao <= alvo else 'generations'
+        except _Deadline:
+            stop_reason = 'deadline'
+        elapsed = time.perf_counter() - start
+
+    return {
+        'variant': variant,
+        'seed': seed,
+        'duration': resultado['duration'],
+        'time_to_feasible': resultado['time_to_feasible'],
+        'time_to_target': {str(alvo): t for alvo, t in resultado['time_to_target'].items()},
+        'generations': generations,
+        'evaluations': evaluations,
+        'elapsed': elapsed,
+        'evaluations_per_second': evaluations / elapsed,
+        'stop_reason': stop_reason,
+    }
+
+
+# Estatísticas de uma lista de valores; None (alvo não atingido) conta como falha e fica fora dos quartis
+def summarize(valores):
+    atingidos = np.array([v for v in valores if v is not None], dtype=float)
+    resumo = {'runs': len(valores), 'reached': len(atingidos)}
+    if len(atingidos):
+        q1, mediana, q3 = np.percentile(atingidos, [25, 50, 75])
+        resumo.update({'min': float(atingidos.min()), 'q1': float(q1), 'median': float(mediana), 'q3': float(q3),
+                       'max': float(atingidos.max()), 'mean': float(atingidos.mean())})
+    return resumo
+
+
+# Executar todas as variantes e sementes (as execuções em paralelo, cada uma num processo novo) e resumir
+# por variante: tempo até à primeira solução admissível, tempo até cada alvo, duração final e avaliações/s
+def run(variants=tuple(VARIANTS), seeds=SEEDS, time_budget=TIME_BUDGET, targets=TARGET_DURATIONS,
+        workers=WORKERS):
+    import avaliacao
+    import combinacoes
+    import exato
+
+    otimo = exato.solve(combinacoes.CombinationTable(avaliacao.load_durations()))['duration']
+    targets = sorted(set(targets) | {otimo})
+
+    with ProcessPoolExecutor(max_workers=workers, max_tasks_per_child=1) as executor:
+        futuros = [executor.submit(_run, variant, seed, time_budget, targets)
+                   for variant in variants for seed in seeds]
+        results = [futuro.result() for futuro in futuros]
+
+    summary = {}
+    for variant in variants:
+        execucoes = [r for r in results if r['variant'] == variant]
+        summary[variant] = {
+            'time_to_feasible': summarize([r['time_to_feasible'] for r in execucoes]),
+            'time_to_target': {str(alvo): summarize([r['time_to_target'][str(alvo)] for r in execucoes])
+                               for alvo in targets},
+            'duration': summarize([r['duration'] for r in execucoes]),
+            'evaluations_per_second': summarize([r['evaluations_per_second'] for r in execucoes]),
+        }
+
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'workers': workers,
+            'time_budget': time_budget,
+            'targets': targets,
+            'optimum': otimo,
+            'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'summary': summary,
+        'results': results,
+    }
+
+
+def _format(resumo, unidade=''):
+    if not resumo['reached']:
+        return f"0/{resumo['runs']}"
+    return (f"{resumo['median']:.2f}{unidade} [{resumo['q1']:.2f}, {resumo['q3']:.2f}] "
+            f"({resumo['reached']}/{resumo['runs']})")
+
+
+if __name__ == '__main__':
+    comparacao = run()
+    with open(RESULTS_FILE, 'w') as f:
+        json.dump(comparacao, f, indent=2)
+
+    # Mediana [1.º quartil, 3.º quartil] (execuções que atingiram / execuções)
+    print(f"Prazo {comparacao['meta']['time_budget']} s, ótimo {comparacao['meta']['optimum']}")
+    for variant, resumo in comparacao['summary'].items():
+        print(f'{variant}:')
+        print(f"  1.ª admissível: {_format(resumo['time_to_feasible'], ' s')}")
+        for alvo, tempo in resumo['time_to_target'].items():
+            print(f'  duração <= {alvo}: {_format(tempo, " s")}')
+        print(f"  duração final: {_format(resumo['duration'])}")
+        print(f"  avaliações/s: {_format(resumo['evaluations_per_second'])}")
@@ -0,0 +1,135 @@
+import random
+
+import numpy as np
+
+from avaliacao import NUM_PROCEDURES, NUM_NURSES, MAX_PROCEDURES_PER_NURSE, period_pairs
+
+_PROCEDIMENTOS = np.arange(NUM_PROCEDURES)
+
+# Outro procedimento do mesmo período, para cada procedimento
+_PARCEIRO = np.empty(NUM_PROCEDURES, dtype=np.intp)
+for _p1, _p2 in period_pairs:
+    _PARCEIRO[_p1], _PARCEIRO[_p2] = _p2, _p1
+_BIT = 1 << np.arange(NUM_NURSES)  # Máscara de bits de cada enfermeiro
+_PRIMEIRO = np.array([p1 for p1, _ in period_pairs])
+_SEGUNDO = np.array([p2 for _, p2 in period_pairs])
+
+
+# Ordem de construção: períodos com menos equipas válidas primeiro e, dentro de cada período,
+# o procedimento mais restrito primeiro
+def _construction_order(tabela):
+    validas = tabela.valida.sum(axis=1)
+    pares = [tuple(sorted(par, key=lambda p: validas[p])) for par in period_pairs]
+    return sorted(pares, key=lambda par: (validas[par[0]], validas[par[1]]))
+
+
+# Passos de reparação antes de desistir (cada passo faz no máximo uma substituição por posição)
+MAX_REPAIR_ROUNDS = 20
+# Sorteios da amostragem construtiva antes de recorrer à reparação (e, no limite, às penalidades)
+MAX_CONSTRUCTION_DRAWS = 5
+
+
+# Amostragem construtiva: gera diretamente um cromossoma (índices de combinação) com equipas válidas,
+# sem enfermeiros repetidos no mesmo período e sem ninguém acima das 5 participações. Um sorteio só falha
+# se chegar a um procedimento sem nenhuma equipa com capacidade (beco sem saída); nesse caso sorteia de
+# novo, no máximo MAX_CONSTRUCTION_DRAWS vezes, e depois repara o último. Em instâncias sem solução
+# admissível devolve o que a reparação conseguir, e o resto fica para as penalidades.
+def construct(tabela):
+    for _ in range(MAX_CONSTRUCTION_DRAWS):
+        cromossoma = _sample(tabela)
+        if not tabela.violations([cromossoma])[0]:
+            return cromossoma
+    return repair(tabela, cromossoma)
+
+
+# Um sorteio da amostragem construtiva. Cada equipa é sorteada entre as combinações ainda possíveis,
+# por isso o custo por sorteio é fixo.
+def _sample(tabela):
+    carga = np.zeros(NUM_NURSES, dtype=np.int32)
+    cromossoma = [0] * NUM_PROCEDURES
+
+    for p1, p2 in _construction_order(tabela):
+        anterior = None
+        for procedure in (p1, p2):
+            possiveis = tabela.valida[procedure].copy()
+            if anterior is not None:
+                possiveis &= tabela.disjuntas[anterior]
+
+            # Só equipas em que todos os enfermeiros ainda têm capacidade, com peso proporcional à capacidade
+            # que lhes resta, para não esgotar ninguém antes dos últimos períodos
+            livres = np.maximum(MAX_PROCEDURES_PER_NURSE - carga, 0)
+            com_capacidade = possiveis & (tabela.membros @ (livres == 0) == 0)
+            pesos = np.where(com_capacidade, np.prod(livres[tabela.equipas], axis=1), 0)
+
+            # Beco sem saída: qualquer equipa possível, senão qualquer equipa válida, senão qualquer equipa
+            # (a reparação e as penalidades tratam do resto)
+            for alternativa in (possiveis, tabela.valida[procedure], np.ones_like(possiveis)):
+                if pesos.any():
+                    break
+                pesos = alternativa
+
+            escolha = random.choices(range(len(pesos)), weights=pesos.tolist())[0]
+            cromossoma[procedure] = escolha
+            carga += tabela.membros[escolha]
+            anterior = escolha
+
+    return cromossoma
+
+
+# Operador de reparação de uma população (indivíduos x procedimentos), vetorizado sobre os indivíduos que
+# violam alguma restrição. Em cada ronda troca, em cada período, uma equipa inválida (categoria ou
+# sentinela) ou com enfermeiros repetidos no período e, em cada indivíduo, uma equipa com um enfermeiro
+# acima das 5 participações, por uma equipa válida, sem ninguém do outro procedimento do período e sem
+# enfermeiros já sem capacidade; de preferência uma que só mude um enfermeiro (como a reparação por
+# enfermeiro), senão qualquer uma. Repete até não haver violações, no máximo MAX_REPAIR_ROUNDS rondas:
+# é um melhor esforço, e o que ainda violar alguma restrição fica para as penalidades.
+def repair_population(tabela, populacao, rng, max_rounds=MAX_REPAIR_ROUNDS):
+    ativos = np.flatnonzero(tabela.violations(populacao))
+    for _ in range(max_rounds):
+        if not len(ativos):
+            break
+        ids = populacao[ativos].astype(np.intp)
+        equipas = tabela.membros[ids]  # (indivíduos, procedimentos, enfermeiros)
+        carga = equipas.sum(axis=1)
+
+        # Equipas com problemas
+        locais = ~tabela.valida[_PROCEDIMENTOS, ids] | ~tabela.disjuntas[ids, ids[:, _PARCEIRO]]
+        excesso = (tabela.bits[ids] & ((carga > MAX_PROCEDURES_PER_NURSE) @ _BIT)[:, None]) != 0
+        resolvidos = ~(locais | excesso).any(axis=1)
+        if resolvidos.any():
+            ativos, ids, equipas, carga, locais, excesso = (
+                x[~resolvidos] for x in (ativos, ids, equipas, carga, locais, excesso))
+            if not len(ativos):
+                break
+
+        # Uma equipa sorteada entre as com problemas locais de cada período e, nos períodos sem nenhuma, a
+        # equipa sorteada entre as com excesso de cada indivíduo
+        sorteio = np.where(locais, rng.random(locais.shape), -1)
+        escolha = np.where(sorteio[:, _PRIMEIRO] >= sorteio[:, _SEGUNDO], _PRIMEIRO, _SEGUNDO)
+        marcadas = np.zeros_like(locais)
+        linhas = np.arange(len(ativos))[:, None]
+        marcadas[linhas, escolha] = np.maximum(sorteio[:, _PRIMEIRO], sorteio[:, _SEGUNDO]) >= 0
+        sobrecarga = np.where(excesso, rng.random(excesso.shape), -1).argmax(axis=1)
+        livre = ~(marcadas[linhas[:, 0], sobrecarga] | marcadas[linhas[:, 0], _PARCEIRO[sobrecarga]])
+        marcadas[linhas[:, 0], sobrecarga] |= livre & excesso[linhas[:, 0], sobrecarga]
+        linha, gene = np.nonzero(marcadas)
+
+        atual = ids[linha, gene]
+        cheios = ((carga[linha] - equipas[linha, gene]) >= MAX_PROCEDURES_PER_NURSE) @ _BIT
+
+        # Candidatas, da mais à menos exigente; cada equipa usa o primeiro nível que tenha alguma
+        validas = tabela.valida[gene]
+        possiveis = validas & tabela.disjuntas[ids[linha, _PARCEIRO[gene]]]
+        com_capacidade = possiveis & ((tabela.bits & cheios[:, None]) == 0)
+        candidatas = np.ones_like(validas)
+        for nivel in (validas, possiveis, com_capacidade, com_capacidade & tabela.vizinhas[atual]):
+            candidatas = np.where(nivel.any(axis=1)[:, None], nivel, candidatas)
+
+        populacao[ativos[linha], gene] = np.where(candidatas, rng.random(candidatas.shape), -1).argmax(axis=1)
+    return populacao
+
+
+# Reparação de um só cromossoma (lista de índices de combinação), com o gerador de `random`
+def repair(tabela, cromossoma):
+    rng = np.random.default_rng(random.getrandbits(64))
+    return repair_population(tabela, np.array([cromossoma], dtype=np.uint8), rng)[0].tolist()
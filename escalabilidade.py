@@ -0,0 +1,109 @@
+import json
+import os
+import platform
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import gerador
+import modelo
+
+# Tamanhos a testar: (procedimentos, enfermeiros, salas por período)
+SIZES = [(14, 10, 2), (100, 40, 4), (400, 150, 5), (1000, 300, 6), (2000, 600, 6)]
+SEEDS = (0, 1, 2)
+TIME_BUDGET = 10.0  # Segundos de AG por execução
+TARGET_GAP = 0.10  # Alvo: solução admissível até 10% acima do limite inferior
+RESULTS_FILE = 'benchmark_escala.json'
+REGRESSION_TOLERANCE = 0.2  # Queda de avaliações/s (em relação aos resultados anteriores) que conta como regressão
+
+
+# Uma execução, num processo novo para a memória máxima (ru_maxrss) ser só a desta instância
+def _run(num_procedures, num_nurses, rooms, seed, time_budget, target_gap):
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    instance = gerador.generate(num_procedures, num_nurses, rooms, seed=seed)
+    limite = instance.lower_bound()
+    alvo = limite * (1 + target_gap)
+
+    # Tempo até à primeira solução admissível dentro do gap pedido (o observador é chamado a cada geração)
+    time_to_target = None
+
+    def observer(generation, fitness, duration):
+        nonlocal time_to_target
+        if time_to_target is None and -fitness <= duration <= alvo:
+            time_to_target = time.perf_counter() - start
+
+    resultado = modelo.genetic_algorithm(instance, generations=10 ** 9, time_budget=time_budget, seed=seed,
+                                         observer=observer)
+    return {
+        'procedures': num_procedures,
+        'nurses': num_nurses,
+        'rooms': rooms,
+        'seed': seed,
+        'lower_bound': limite,
+        'duration': resultado['duration'],
+        'feasible': bool(resultado['feasible']),
+        'gap': resultado['duration'] / limite - 1,
+        'time_to_target': time_to_target,
+        'generations': resultado['generations'],
+        'evaluations_per_second': resultado['evaluations_per_second'],
+        'elapsed': time.perf_counter() - start,
+        'baseline_rss_kb': baseline_rss,
+        'peak_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+# Executar todos os tamanhos e sementes, um de cada vez (para não disputarem o CPU), cada um num processo novo
+def run(sizes=SIZES, seeds=SEEDS, time_budget=TIME_BUDGET, target_gap=TARGET_GAP):
+    with ProcessPoolExecutor(max_workers=1, max_tasks_per_child=1) as executor:
+        futuros = [executor.submit(_run, *size, seed, time_budget, target_gap) for size in sizes for seed in seeds]
+        results = [futuro.result() for futuro in futuros]
+
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'time_budget': time_budget,
+            'target_gap': target_gap,
+            'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': results,
+    }
+
+
+# Tamanhos em que a mediana das avaliações/s caiu mais do que `tolerance` em relação a `baseline`
+def regressions(current, baseline, tolerance=REGRESSION_TOLERANCE):
+    def medians(dados):
+        por_tamanho = {}
+        for r in dados['results']:
+            por_tamanho.setdefault((r['procedures'], r['nurses'], r['rooms']), []).append(r['evaluations_per_second'])
+        return {size: float(np.median(valores)) for size, valores in por_tamanho.items()}
+
+    antes, agora = medians(baseline), medians(current)
+    return [(size, antes[size], agora[size]) for size in agora
+            if size in antes and agora[size] < (1 - tolerance) * antes[size]]
+
+
+if __name__ == '__main__':
+    baseline = None
+    if os.path.exists(RESULTS_FILE):
+        with open(RESULTS_FILE) as f:
+            baseline = json.load(f)
+
+    current = run()
+    with open(RESULTS_FILE, 'w') as f:
+        json.dump(current, f, indent=2)
+
+    for r in current['results']:
+        alvo = '-' if r['time_to_target'] is None else f"{r['time_to_target']:.2f} s"
+        print(f"{r['procedures']:>5} proc. {r['nurses']:>4} enf. {r['rooms']} salas, semente {r['seed']}: "
+              f"duração {r['duration']} (gap {r['gap']:.1%}), {r['evaluations_per_second']:.0f} aval./s, "
+              f"alvo {alvo}, memória máx. {r['peak_rss_kb'] / 1024:.0f} MB")
+
+    if baseline is not None:
+        for size, antes, agora in regressions(current, baseline):
+            print(f'Regressão em {size}: {antes:.0f} -> {agora:.0f} avaliações/s')
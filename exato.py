@@ -0,0 +1,143 @@
+import time
+
+import numpy as np
+
+from avaliacao import NUM_PROCEDURES, NUM_NURSES, MAX_PROCEDURES_PER_NURSE, period_pairs
+
+# Carga de cada enfermeiro guardada num inteiro, 4 bits por enfermeiro, a começar em 8 - 5 - 1 = 2:
+# uma participação a mais do que as 5 permitidas liga o bit mais alto do campo do enfermeiro
+_BITS = 4
+_INICIO = (1 << (_BITS - 1)) - MAX_PROCEDURES_PER_NURSE - 1
+_ALTO = sum(1 << (_BITS * e + _BITS - 1) for e in range(NUM_NURSES))
+_CARGA_INICIAL = sum(_INICIO << (_BITS * e) for e in range(NUM_NURSES))
+
+
+# Pares de equipas admissíveis de um período (válidas e sem enfermeiros em comum) e a duração do período
+def _period_pairs(tabela, p1, p2):
+    a, b = np.nonzero(tabela.valida[p1][:, None] & tabela.valida[p2][None, :] & tabela.disjuntas)
+    return a, b, np.maximum(tabela.duracoes[p1, a], tabela.duracoes[p2, b])
+
+
+# Os mesmos pares ordenados pela duração do período: (duração, combinação do 1.º procedimento,
+# combinação do 2.º, carga a somar)
+def _period_options(tabela, p1, p2):
+    a, b, duracao = _period_pairs(tabela, p1, p2)
+    ordem = np.argsort(duracao, kind='stable')
+
+    pesos = 1 << (_BITS * np.arange(NUM_NURSES, dtype=np.int64))
+    carga = (tabela.membros[a] + tabela.membros[b]) @ pesos
+    return list(zip(duracao[ordem].tolist(), a[ordem].tolist(), b[ordem].tolist(), carga[ordem].tolist()))
+
+
+# Limite inferior admissível da duração total, o maior de dois:
+# - a soma, por período, do melhor par de equipas admissível, ignorando o limite de 5 participações;
+# - a relaxação Lagrangiana desse limite: cada participação do enfermeiro e custa lambda[e] e o total
+#   recebe 5 * sum(lambda); para qualquer lambda >= 0 o mínimo separa-se por período e é um limite
+#   inferior, que se aperta por subgradiente. Como as durações são inteiras, arredonda-se para cima.
+def lower_bound(tabela, iterations=300):
+    periodos = []
+    for p1, p2 in period_pairs:
+        a, b, duracao = _period_pairs(tabela, p1, p2)
+        if not len(duracao):
+            return None  # Há um período sem nenhum par admissível
+        periodos.append((duracao.astype(np.float64), (tabela.membros[a] + tabela.membros[b]).astype(np.float64)))
+
+    combinatorio = int(sum(duracao.min() for duracao, _ in periodos))
+
+    lambdas = np.zeros(NUM_NURSES)
+    melhor = float('-inf')
+    for iteration in range(iterations):
+        valor = -MAX_PROCEDURES_PER_NURSE * lambdas.sum()
+        subgradiente = np.full(NUM_NURSES, -MAX_PROCEDURES_PER_NURSE, dtype=np.float64)
+        for duracao, carga in periodos:
+            i = (duracao + carga @ lambdas).argmin()
+            valor += duracao[i] + carga[i] @ lambdas
+            subgradiente += carga[i]
+        melhor = max(melhor, valor)
+        lambdas = np.maximum(lambdas + subgradiente / (1 + 0.05 * iteration), 0)
+
+    return max(combinatorio, int(np.ceil(melhor - 1e-6)))
+
+
+# Solução exata por branch-and-bound com aprofundamento iterativo sobre a folga em relação ao limite
+# inferior (soma, por período, do melhor par de equipas ignorando a carga). Para cada folga, a pesquisa
+# em profundidade percorre os períodos do mais restrito para o menos restrito e só experimenta pares cuja
+# duração caiba na folga que resta. Os estados (período, vetor de cargas) já esgotados são memorizados
+# com a maior folga com que falharam: com a mesma carga e menos folga também não há solução.
+# A primeira folga com solução dá a duração mínima, porque todas as folgas inferiores foram esgotadas.
+# Antes do aprofundamento, uma pesquisa com a folga máxima confirma que existe alguma solução.
+def solve(tabela, max_slack=None):
+    start = time.perf_counter()
+    periodos = [(p1, p2, _period_options(tabela, p1, p2)) for p1, p2 in period_pairs]
+    if not all(opcoes for _, _, opcoes in periodos):
+        return None  # Há um período sem nenhum par admissível
+
+    periodos.sort(key=lambda periodo: len(periodo[2]))
+    minimos = [opcoes[0][0] for _, _, opcoes in periodos]
+    lower_bound = sum(minimos)
+
+    escolhas = [None] * len(periodos)
+    falhas = [{} for _ in periodos]
+    nodes = 0
+
+    def search(nivel, carga, folga):
+        nonlocal nodes
+        if nivel == len(periodos):
+            return True
+        if falhas[nivel].get(carga, -1) >= folga:
+            return False
+        nodes += 1
+
+        limite = minimos[nivel] + folga
+        for duracao, a, b, soma in periodos[nivel][2]:
+            if duracao > limite:
+                break
+            nova = carga + soma
+            if nova & _ALTO:
+                continue
+            escolhas[nivel] = (a, b)
+            if search(nivel + 1, nova, folga - (duracao - minimos[nivel])):
+                return True
+
+        falhas[nivel][carga] = folga
+        return False
+
+    # A folga nunca passa da diferença entre o pior e o melhor par de cada período
+    maior_folga = sum(opcoes[-1][0] - opcoes[0][0] for _, _, opcoes in periodos)
+    if max_slack is not None:
+        maior_folga = min(maior_folga, max_slack)
+
+    # Uma só pesquisa com a folga toda deteta as instâncias sem solução, que de outro modo esgotariam
+    # todas as folgas uma a uma; as falhas memorizadas continuam válidas para as folgas menores
+    if not search(0, _CARGA_INICIAL, maior_folga):
+        return None
+
+    for folga in range(maior_folga + 1):
+        if search(0, _CARGA_INICIAL, folga):
+            cromossoma = [0] * NUM_PROCEDURES
+            for (p1, p2, _), (a, b) in zip(periodos, escolhas):
+                cromossoma[p1], cromossoma[p2] = a, b
+            return {
+                'solution': cromossoma,
+                'duration': lower_bound + folga,
+                'lower_bound': lower_bound,
+                'nodes': nodes,
+                'elapsed': time.perf_counter() - start,
+            }
+
+    return None  # Sem solução admissível (ou nenhuma dentro de max_slack)
+
+
+if __name__ == '__main__':
+    import avaliacao
+    import combinacoes
+
+    tabela = combinacoes.CombinationTable(avaliacao.load_durations())
+    resultado = solve(tabela)
+    if resultado is None:
+        print('Não existe nenhuma solução admissível')
+    else:
+        print('Solução ótima:')
+        print(combinacoes.decode(resultado['solution']))
+        print(f"Duração mínima: {resultado['duration']} (limite inferior {resultado['lower_bound']}), "
+              f"{resultado['nodes']} nós em {resultado['elapsed']:.2f} s")
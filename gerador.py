@@ -0,0 +1,38 @@
+import math
+
+import numpy as np
+
+import modelo
+
+# Parâmetros por omissão, tirados da instância do enunciado (Trab_Grupo.xlsx)
+MIN_DURATION = 45
+MAX_DURATION = 90
+COMPLEX_FRACTION = 5 / 14  # Procedimentos complexos (não podem ter enfermeiros da categoria 1)
+CATEGORY_FRACTIONS = (0.4, 0.4, 0.2)  # Enfermeiros das categorias 1, 2 e 3
+TEAM_SIZE = 3
+CAP_SLACK = 1.2  # Capacidade por enfermeiro em relação à carga média (5 / 4.2 no enunciado)
+
+
+# Gerador de instâncias aleatórias com a estrutura do enunciado, reprodutível pela semente:
+# - tempos uniformes entre MIN_DURATION e MAX_DURATION, com SENTINELA onde a categoria 1 encontra um
+#   procedimento complexo (como no Excel);
+# - `rooms` procedimentos por período (2 no enunciado);
+# - categorias 1, 2 e 3 nas proporções de CATEGORY_FRACTIONS;
+# - capacidade igual à carga média vezes CAP_SLACK, arredondada para cima.
+def generate(num_procedures, num_nurses, rooms=2, seed=None, team_size=TEAM_SIZE, cap=None,
+             complex_fraction=COMPLEX_FRACTION, category_fractions=CATEGORY_FRACTIONS):
+    rng = np.random.default_rng(seed)
+
+    tempos = rng.integers(MIN_DURATION, MAX_DURATION + 1, (num_procedures, num_nurses), dtype=np.int32)
+    categorias = rng.choice(np.arange(1, len(category_fractions) + 1), size=num_nurses, p=category_fractions)
+    complexos = rng.random(num_procedures) < complex_fraction
+    tempos[np.ix_(complexos, categorias == 1)] = modelo.SENTINELA
+
+    proibidas = np.zeros((num_procedures, len(category_fractions) + 1), dtype=bool)
+    proibidas[complexos, 1] = True
+    if cap is None:
+        cap = math.ceil(num_procedures * team_size / num_nurses * CAP_SLACK)
+
+    periodos = np.arange(num_procedures) // rooms
+    return modelo.Instance(tempos, periodos, team_sizes=team_size, caps=cap, categorias=categorias,
+                           proibidas=proibidas)
@@ -0,0 +1,213 @@
+import multiprocessing as mp
+import os
+import queue
+import random
+import time
+import traceback
+
+import numpy as np
+
+import AG_final
+import combinacoes
+
+# Constantes do AG_final que cada ilha pode sobrepor, com o teste de cada valor
+CONFIGURABLE = {
+    'POPULATION_SIZE': lambda v: isinstance(v, int) and v >= 3,
+    'CROSSOVER_TYPE': lambda v: v in ('multi-point', 'uniform'),
+    'CROSSOVER_POINT_K': lambda v: isinstance(v, int) and 1 <= v < AG_final.NUM_PROCEDURES,
+    'SELECTION_TYPE': lambda v: v in ('tournament', 'fitness-proportional', 'rank', 'random'),
+    'TOURNAMENT_K': lambda v: isinstance(v, int) and v >= 1,
+    'MUTATION_TYPE': lambda v: v in ('random_reseting', 'swap'),
+    'MUTATION_RATE': lambda v: isinstance(v, (int, float)) and 0 <= v <= 1,
+    'REPAIR': lambda v: isinstance(v, bool),
+    'CACHE_SIZE': lambda v: isinstance(v, int) and v >= 0,
+    'MEMETIC': lambda v: v in (None, 'first', 'best'),
+    'MEMETIC_TOP_K': lambda v: isinstance(v, int) and v >= 0,
+}
+RESULT_TIMEOUT = 1.0  # Segundos entre verificações de que as ilhas ainda estão vivas, enquanto se esperam resultados
+
+GENERATIONS = AG_final.GENERATIONS
+MIGRATION_INTERVAL = 50  # Gerações entre migrações
+MIGRANTS = 2  # Melhores indivíduos enviados à ilha seguinte em cada migração
+TARGET_DURATION = None  # Paragem global quando uma ilha encontra uma solução admissível com esta duração
+                        # (None: o limite inferior do AG_final, a partir do qual não há melhor)
+
+# Configuração de cada ilha: combinações diferentes de seleção, crossover e mutação
+ISLAND_SETTINGS = [
+    {'SELECTION_TYPE': 'tournament', 'CROSSOVER_TYPE': 'multi-point', 'MUTATION_TYPE': 'random_reseting'},
+    {'SELECTION_TYPE': 'tournament', 'CROSSOVER_TYPE': 'uniform', 'MUTATION_TYPE': 'random_reseting'},
+    {'SELECTION_TYPE': 'rank', 'CROSSOVER_TYPE': 'multi-point', 'MUTATION_TYPE': 'swap'},
+    {'SELECTION_TYPE': 'rank', 'CROSSOVER_TYPE': 'uniform', 'MUTATION_TYPE': 'random_reseting'},
+]
+
+
+# Verifica os nomes e os valores das definições de uma ilha
+def validate(settings):
+    for name, value in settings.items():
+        if name not in CONFIGURABLE:
+            raise ValueError(f'Definição desconhecida para a ilha: {name}')
+        if not CONFIGURABLE[name](value):
+            raise ValueError(f'Valor inválido para {name}: {value!r}')
+    tamanho = settings.get('POPULATION_SIZE', AG_final.POPULATION_SIZE)
+    if settings.get('TOURNAMENT_K', AG_final.TOURNAMENT_K) > tamanho - 1:
+        raise ValueError(f'TOURNAMENT_K maior do que a população ({tamanho - 1} indivíduos)')
+
+
+# Aplica as definições da ilha às constantes do AG_final (cada ilha corre no seu próprio processo)
+def configure(settings):
+    validate(settings)
+    for name, value in settings.items():
+        setattr(AG_final, name, value)
+
+
+# Evolução de uma ilha: envia os melhores indivíduos para a ilha seguinte (anel) a cada
+# `migration_interval` gerações e substitui os piores pelos imigrantes recebidos
+def _evolve_island(island, settings, generations, migration_interval, migrants, target_duration, seed,
+                   inbox, outbox, stop, results):
+    configure(settings)
+    if AG_final.tabela is None:
+        AG_final.load_instance()
+    random.seed(None if seed is None else seed + island)
+    AG_final.rng = np.random.default_rng(None if seed is None else seed + island)
+    # A cache de fitness e os ótimos locais herdados do processo pai podem ser de outra instância ou pesos
+    AG_final.cache.clear()
+    AG_final.otimos_locais.clear()
+    start = time.perf_counter()
+
+    population = AG_final.initialize_population(AG_final.POPULATION_SIZE - 1)
+    fitness_scores, durations = AG_final.evaluate_population(population)
+    evaluations = len(population)
+    alvo = AG_final.limite_inferior if target_duration is None else target_duration
+
+    # A melhor solução parte do melhor indivíduo inicial, para haver sempre uma solução a devolver
+    # (mesmo que a paragem global chegue antes da primeira geração)
+    best = int(fitness_scores.argmax())
+    best_fitness = int(fitness_scores[best])
+    best_duration = int(durations[best])
+    best_solution = population[best].tolist()
+    if AG_final.is_feasible(best_fitness, best_duration) and best_duration <= alvo:
+        stop.set()
+    generations_done = 0
+
+    for generation in range(1, generations + 1):
+        if stop.is_set():
+            break
+
+        population = AG_final.evolve_population(population, fitness_scores)
+        fitness_scores, durations = AG_final.evaluate_population(population)
+        evaluations += len(population)
+        if AG_final.MEMETIC:
+            population, fitness_scores, durations = AG_final.local_search(population, fitness_scores, durations)
+
+        if generation % migration_interval == 0:
+            ordem = fitness_scores.argsort()
+            for i in ordem[-migrants:]:
+                try:
+                    outbox.put_nowait((population[i], int(fitness_scores[i]), int(durations[i])))
+                except queue.Full:
+                    break  # A ilha seguinte ainda não consumiu os anteriores; não bloquear
+
+            for i in ordem[:migrants]:
+                try:
+                    population[i], fitness_scores[i], durations[i] = inbox.get_nowait()
+                except queue.Empty:
+                    break
+
+        best = int(fitness_scores.argmax())
+        if fitness_scores[best] > best_fitness:
+            best_fitness = int(fitness_scores[best])
+            best_duration = int(durations[best])
+            best_solution = population[best].tolist()
+            if AG_final.is_feasible(best_fitness, best_duration) and best_duration <= alvo:
+                stop.set()
+        generations_done = generation
+
+    results.put({
+        'island': island,
+        'settings': settings,
+        'solution': best_solution,
+        'fitness': best_fitness,
+        'duration': best_duration,
+        'generations': generations_done,
+        'evaluations': evaluations,
+        'elapsed': time.perf_counter() - start,
+    })
+
+
+# Processo de uma ilha: um erro não pode deixar run_islands à espera do resultado, por isso é devolvido
+# como resultado (com o traceback) e as outras ilhas são mandadas parar
+def _island(island, settings, generations, migration_interval, migrants, target_duration, seed,
+            inbox, outbox, stop, results):
+    try:
+        _evolve_island(island, settings, generations, migration_interval, migrants, target_duration, seed,
+                       inbox, outbox, stop, results)
+    except Exception:
+        stop.set()
+        results.put({'island': island, 'settings': settings, 'error': traceback.format_exc()})
+
+
+# Modelo de ilhas: cada ilha corre num processo com as suas definições e trocam os melhores indivíduos
+def run_islands(island_settings=None, generations=GENERATIONS, migration_interval=MIGRATION_INTERVAL,
+                migrants=MIGRANTS, target_duration=TARGET_DURATION, seed=None):
+    if island_settings is None:
+        island_settings = [ISLAND_SETTINGS[i % len(ISLAND_SETTINGS)] for i in range(os.cpu_count() or 1)]
+    for settings in island_settings:
+        validate(settings)
+
+    # Carregar a instância antes de criar os processos, para as ilhas a herdarem
+    if AG_final.tabela is None:
+        AG_final.load_instance()
+
+    num_islands = len(island_settings)
+    inboxes = [mp.Queue(maxsize=4 * migrants) for _ in range(num_islands)]
+    stop = mp.Event()
+    results = mp.Queue()
+
+    workers = [
+        mp.Process(target=_island, args=(i, settings, generations, migration_interval, migrants, target_duration,
+                                         seed, inboxes[i], inboxes[(i + 1) % num_islands], stop, results))
+        for i, settings in enumerate(island_settings)]
+    for worker in workers:
+        worker.start()
+
+    # Recolher os resultados antes do join, para não bloquear nas filas; uma ilha que morra sem resultado
+    # (ex.: morta pelo sistema) para as outras e termina a espera
+    islands = []
+    while len(islands) < len(workers):
+        try:
+            islands.append(results.get(timeout=RESULT_TIMEOUT))
+        except queue.Empty:
+            mortas = [i for i, worker in enumerate(workers) if worker.exitcode not in (None, 0)]
+            if mortas and results.empty():
+                stop.set()
+                for worker in workers:
+                    worker.join()
+                raise RuntimeError(f'Ilhas terminadas sem resultado: {mortas}')
+    islands.sort(key=lambda r: r['island'])
+    for worker in workers:
+        worker.join()
+
+    erros = [r for r in islands if 'error' in r]
+    if erros:
+        raise RuntimeError(f"Erro na ilha {erros[0]['island']}:\n{erros[0]['error']}")
+
+    best = max(islands, key=lambda r: r['fitness'])
+    return best, islands
+
+
+if __name__ == '__main__':
+    start = time.perf_counter()
+    best, islands = run_islands()
+    elapsed = time.perf_counter() - start
+
+    for resultado in islands:
+        print(f"Ilha {resultado['island']} {resultado['settings']}: Melhor Fitness = {resultado['fitness']}, "
+              f"Duração = {resultado['duration']}, Gerações = {resultado['generations']}")
+
+    evaluations = sum(resultado['evaluations'] for resultado in islands)
+    print('Melhor solução encontrada:')
+    print(combinacoes.decode(best['solution']))
+    print(f"Melhor Fitness: {best['fitness']}, Duração Total: {best['duration']}")
+    print(f"Limite inferior: {AG_final.limite_inferior}, gap de otimalidade: "
+          f"{best['duration'] - AG_final.limite_inferior}")
+    print(f'Avaliações por segundo: {evaluations / elapsed:.0f}')
@@ -0,0 +1,70 @@
+import os
+import tempfile
+
+import numpy as np
+
+from avaliacao import NUM_PROCEDURES, period_pairs, procedimentos_restritos
+
+# O Excel só tem a tabela de tempos; a categoria de cada enfermeiro (E1..E10) e o período e o tipo de cada
+# procedimento vêm do enunciado e são guardados na cache junto com os tempos
+CATEGORIAS = [1, 1, 1, 1, 2, 2, 2, 2, 3, 3]
+PERIODOS = [k for k, par in enumerate(period_pairs) for _ in par]
+
+
+# Ficheiro da cache binária de uma instância: o mesmo nome do Excel com a extensão .npz
+def cache_path(file_path):
+    return os.path.splitext(file_path)[0] + '.npz'
+
+
+# Ler a instância do Excel (lento: pandas + openpyxl)
+def read_excel(file_path):
+    import pandas as pd
+
+    df = pd.read_excel(file_path)
+    tempos = np.ascontiguousarray(df.to_numpy(), dtype=np.int32)
+    return {
+        'tempos': tempos,
+        'categorias': np.array(CATEGORIAS, dtype=np.int8),
+        'periodos': np.array(PERIODOS, dtype=np.int16),
+        'restritos': np.isin(np.arange(NUM_PROCEDURES), list(procedimentos_restritos)),
+    }
+
+
+# Converter o Excel para a cache binária (arrays .npy sem compressão num .npz), guardando a data de
+# modificação do Excel para saber quando a cache fica desatualizada. A escrita é atómica: cada processo
+# escreve num ficheiro temporário próprio na mesma pasta, para conversões simultâneas não se misturarem.
+def convert(file_path, destino=None):
+    destino = cache_path(file_path) if destino is None else destino
+    instancia = read_excel(file_path)
+    descritor, temporario = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(destino)), suffix='.npz')
+    try:
+        with os.fdopen(descritor, 'wb') as f:
+            np.savez(f, mtime_ns=np.int64(os.stat(file_path).st_mtime_ns), **instancia)
+        os.replace(temporario, destino)
+    except BaseException:
+        os.unlink(temporario)
+        raise
+    return instancia
+
+
+# Carregar a instância da cache binária; o Excel só volta a ser lido se a sua data de modificação mudou
+# (ou se ainda não há cache). Sem o Excel, usa a cache que existir.
+def load(file_path='Trab_Grupo.xlsx'):
+    destino = cache_path(file_path)
+    try:
+        mtime_ns = os.stat(file_path).st_mtime_ns
+    except FileNotFoundError:
+        if not os.path.exists(destino):
+            raise
+        mtime_ns = None
+
+    if os.path.exists(destino):
+        try:
+            with np.load(destino) as dados:
+                if mtime_ns is None or int(dados['mtime_ns']) == mtime_ns:
+                    return {nome: dados[nome] for nome in dados.files if nome != 'mtime_ns'}
+        except (OSError, ValueError, KeyError):
+            if mtime_ns is None:
+                raise  # Cache ilegível e sem Excel para a refazer
+
+    return convert(file_path, destino)
@@ -0,0 +1,149 @@
+import math
+import random
+import time
+
+import avaliacao
+import busca_local
+import combinacoes
+import construcao
+
+# Recozimento simulado
+SA_ITERATIONS = 200000
+INITIAL_TEMPERATURE = 100.0
+FINAL_TEMPERATURE = 1.0
+COOLING = 'geometric'  # geometric, linear
+
+# Pesquisa tabu
+TABU_ITERATIONS = 5000
+TABU_CANDIDATES = 100  # Movimentos aleatórios avaliados em cada iteração
+TABU_TENURE = (5, 12)  # Iterações em que um enfermeiro retirado de um procedimento não pode voltar (mín., máx.)
+
+MOVES = busca_local.MOVES
+
+
+# Temperatura na iteração `iteration` de `iterations`, de INITIAL_TEMPERATURE até FINAL_TEMPERATURE
+def temperature(iteration, iterations, cooling=COOLING, initial=INITIAL_TEMPERATURE, final=FINAL_TEMPERATURE):
+    fracao = iteration / max(iterations - 1, 1)
+    match cooling:
+        case 'geometric':
+            return initial * (final / initial) ** fracao
+        case 'linear':
+            return initial + (final - initial) * fracao
+    raise ValueError(f'Arrefecimento desconhecido: {cooling}')
+
+
+# Melhor solução, avaliações e tempo até ao alvo de uma execução. Partilhado pelas duas pesquisas.
+class _Progress:
+    def __init__(self, avaliador, target_duration):
+        self.start = time.perf_counter()
+        self.target_duration = target_duration
+        self.evaluations = 0
+        self.time_to_target = None
+        self.best_fitness, self.best_duration = avaliador.fitness()
+        self.best_solution = avaliador.solution()
+
+    # Regista o estado atual se for o melhor até agora; devolve True quando o alvo é atingido
+    def update(self, avaliador, fitness, duration):
+        if fitness > self.best_fitness:
+            self.best_fitness, self.best_duration = fitness, duration
+            self.best_solution = avaliador.solution()
+        if (self.time_to_target is None and self.target_duration is not None
+                and -self.best_fitness <= self.best_duration <= self.target_duration):
+            self.time_to_target = time.perf_counter() - self.start
+        return self.time_to_target is not None
+
+    def result(self):
+        elapsed = time.perf_counter() - self.start
+        return {
+            'solution': combinacoes.encode(self.best_solution),
+            'fitness': self.best_fitness,
+            'duration': self.best_duration,
+            'evaluations': self.evaluations,
+            'elapsed': elapsed,
+            'evaluations_per_second': self.evaluations / elapsed if elapsed else 0.0,
+            'time_to_target': self.time_to_target,
+        }
+
+
+# Recozimento simulado: um movimento aleatório por iteração, avaliado em O(1) sobre o IncrementalEvaluator;
+# as pioras são aceites com probabilidade exp(delta / T). Parte de uma solução construtiva e para ao atingir
+# `target_duration` com uma solução admissível.
+def simulated_annealing(tabela, tempos, iterations=SA_ITERATIONS, cooling=COOLING, initial=INITIAL_TEMPERATURE,
+                        final=FINAL_TEMPERATURE, moves=MOVES, target_duration=None, **penalidades):
+    avaliador = avaliacao.IncrementalEvaluator(combinacoes.decode(construcao.construct(tabela)), tempos,
+                                               **penalidades)
+    progresso = _Progress(avaliador, target_duration)
+    atual = progresso.best_fitness
+    if progresso.update(avaliador, *avaliador.fitness()):
+        return progresso.result()
+
+    for iteration in range(iterations):
+        t = temperature(iteration, iterations, cooling, initial, final)
+        movimento = busca_local.random_move(avaliador, moves)
+        desfazer = busca_local.apply_move(avaliador, movimento)
+        fitness, duration = avaliador.fitness()
+        progresso.evaluations += 1
+
+        delta = fitness - atual
+        if delta >= 0 or random.random() < math.exp(delta / t):
+            atual = fitness
+            if progresso.update(avaliador, fitness, duration):
+                break
+        else:
+            busca_local.apply_move(avaliador, desfazer)
+
+    return progresso.result()
+
+
+# Pesquisa tabu: em cada iteração avalia `candidates` movimentos aleatórios e aplica o melhor que não seja
+# tabu (mesmo que piore). Um enfermeiro retirado de um procedimento não pode voltar a ele durante um número
+# de iterações sorteado em `tenure`; um movimento tabu é aceite se der a melhor solução até agora (aspiração).
+def tabu_search(tabela, tempos, iterations=TABU_ITERATIONS, candidates=TABU_CANDIDATES, tenure=TABU_TENURE,
+                moves=MOVES, target_duration=None, **penalidades):
+    avaliador = avaliacao.IncrementalEvaluator(combinacoes.decode(construcao.construct(tabela)), tempos,
+                                               **penalidades)
+    progresso = _Progress(avaliador, target_duration)
+    if progresso.update(avaliador, *avaliador.fitness()):
+        return progresso.result()
+
+    tabu = {}  # (procedimento, enfermeiro) -> última iteração em que é tabu
+    for iteration in range(iterations):
+        melhor, melhor_movimento = None, None
+        for _ in range(candidates):
+            movimento = busca_local.random_move(avaliador, moves)
+            desfazer = busca_local.apply_move(avaliador, movimento)
+            fitness, duration = avaliador.fitness()
+            busca_local.apply_move(avaliador, desfazer)
+            progresso.evaluations += 1
+
+            proibido = any(tabu.get((procedure, enfermeiro), -1) >= iteration
+                           for procedure, _, enfermeiro in movimento)
+            if proibido and fitness <= progresso.best_fitness:
+                continue
+            if melhor is None or fitness > melhor:
+                melhor, melhor_movimento = fitness, movimento
+
+        if melhor_movimento is None:
+            continue  # Todos os candidatos eram tabu
+
+        for procedure, slot, _ in melhor_movimento:
+            tabu[(procedure, avaliador.equipas[procedure][slot])] = iteration + random.randint(*tenure)
+        busca_local.apply_move(avaliador, melhor_movimento)
+        if progresso.update(avaliador, *avaliador.fitness()):
+            break
+
+    return progresso.result()
+
+
+if __name__ == '__main__':
+    import AG_final
+
+    AG_final.load_instance()
+    for nome, pesquisa in (('Recozimento simulado', simulated_annealing), ('Pesquisa tabu', tabu_search)):
+        resultado = pesquisa(AG_final.tabela, AG_final.tempos, target_duration=AG_final.limite_inferior,
+                             **AG_final.PENALTIES)
+        print(f'{nome}:')
+        print(combinacoes.decode(resultado['solution']))
+        alvo = 'não atingido' if resultado['time_to_target'] is None else f"{resultado['time_to_target']:.2f} s"
+        print(f"Melhor Fitness: {resultado['fitness']}, Duração Total: {resultado['duration']}, "
+              f"{resultado['evaluations_per_second']:.0f} avaliações/s, tempo até ao alvo: {alvo}")
@@ -0,0 +1,260 @@
+import time
+
+import numpy as np
+
+from avaliacao import MAX_NURSES_PER_PROCEDURE, MAX_PROCEDURES_PER_NURSE
+
+SENTINELA = 999  # Tempo de um enfermeiro que não pode realizar o procedimento
+LIVRE = -1  # Posição vazia numa equipa mais pequena do que a maior equipa da instância
+
+POPULATION_SIZE = 50
+GENERATIONS = 500
+TOURNAMENT_K = 6
+MUTATION_RATE = None  # Probabilidade de mutação por posição; None usa 2 / número de posições da instância
+CANDIDATES = 16  # Enfermeiros aleatórios considerados em cada escolha da construção e da mutação
+
+
+# Instância geral: qualquer número de enfermeiros, procedimentos e períodos (os procedimentos do mesmo
+# período decorrem em salas paralelas e o período dura o que durar o mais longo), equipas de tamanho
+# variável, limite de procedimentos por enfermeiro e regras de categoria dadas pelos dados.
+# - tempos: (procedimentos x enfermeiros), SENTINELA onde o enfermeiro não pode realizar o procedimento
+# - periodos: período de cada procedimento (quaisquer rótulos inteiros)
+# - team_sizes: enfermeiros por procedimento (um valor ou um por procedimento)
+# - caps: máximo de procedimentos por enfermeiro (um valor ou um por enfermeiro)
+# - categorias: categoria de cada enfermeiro (inteiros a partir de 0)
+# - proibidas: (procedimentos x categorias) True quando a categoria não pode realizar o procedimento
+class Instance:
+    def __init__(self, tempos, periodos, team_sizes=MAX_NURSES_PER_PROCEDURE, caps=MAX_PROCEDURES_PER_NURSE,
+                 categorias=None, proibidas=None):
+        self.tempos = np.ascontiguousarray(tempos, dtype=np.int32)
+        self.num_procedures, self.num_nurses = self.tempos.shape
+
+        rotulos, self.periodos = np.unique(np.asarray(periodos), return_inverse=True)
+        self.num_periods = len(rotulos)
+        self.team_sizes = np.broadcast_to(np.asarray(team_sizes, dtype=np.int64), (self.num_procedures,)).copy()
+        self.caps = np.broadcast_to(np.asarray(caps, dtype=np.int64), (self.num_nurses,)).copy()
+        self.categorias = (np.zeros(self.num_nurses, dtype=np.int64) if categorias is None
+                           else np.asarray(categorias, dtype=np.int64))
+        self.proibidas = (np.zeros((self.num_procedures, self.categorias.max() + 1), dtype=bool) if proibidas is None
+                          else np.asarray(proibidas, dtype=bool))
+        self.max_team = int(self.team_sizes.max())
+
+        # Posições ocupadas de cada equipa e enfermeiros que podem realizar cada procedimento
+        self.slots = np.arange(self.max_team)[None, :] < self.team_sizes[:, None]
+        self.pode = (self.tempos != SENTINELA) & ~self.proibidas[:, self.categorias]
+
+        # Procedimentos agrupados por período, para reduzir as durações por período com um único reduceat
+        self._procedures = np.arange(self.num_procedures)[:, None]
+        self._ordem = np.argsort(self.periodos, kind='stable')
+        self._inicios = np.searchsorted(self.periodos[self._ordem], np.arange(self.num_periods))
+        self._por_periodo = np.split(self._ordem, self._inicios[1:])
+
+        # Procedimentos do mesmo período de cada procedimento (salas), repetidos até ao maior número de salas
+        salas = max(len(procedimentos) for procedimentos in self._por_periodo)
+        self._salas = np.empty((self.num_procedures, salas), dtype=np.int64)
+        for procedimentos in self._por_periodo:
+            self._salas[procedimentos] = np.resize(procedimentos, salas)
+
+        # Valores distintos (negativos) para as posições vazias, para nunca contarem como repetidos
+        self._vazias = -1 - np.arange(self.num_procedures * self.max_team).reshape(self.num_procedures, -1)
+
+    # A instância do enunciado, a partir da cache do Excel: categoria 1 proibida nos procedimentos restritos
+    @classmethod
+    def from_file(cls, file_path='Trab_Grupo.xlsx'):
+        import instancia
+
+        dados = instancia.load(file_path)
+        categorias = dados['categorias'].astype(np.int64)
+        proibidas = np.zeros((len(dados['tempos']), categorias.max() + 1), dtype=bool)
+        proibidas[dados['restritos'], 1] = True
+        return cls(dados['tempos'], dados['periodos'], categorias=categorias, proibidas=proibidas)
+
+    @property
+    def size(self):
+        return int(self.team_sizes.sum())
+
+    # Limite inferior admissível da duração total: cada procedimento dura pelo menos o k-ésimo menor tempo dos
+    # enfermeiros que o podem fazer (k = tamanho da equipa) e cada período pelo menos o maior desses mínimos
+    # entre as suas salas (ignora repetidos e capacidade)
+    def lower_bound(self):
+        ordenados = np.sort(np.where(self.pode, self.tempos, np.iinfo(np.int32).max), axis=1)
+        minimos = ordenados[np.arange(self.num_procedures), self.team_sizes - 1]
+        return int(np.maximum.reduceat(minimos[self._ordem], self._inicios).sum())
+
+    # Avaliação vetorizada de uma população (população x procedimentos x max_team, LIVRE nas posições vazias),
+    # com os mesmos termos e pesos de avaliacao.evaluate_population. O custo cresce linearmente com o tamanho
+    # da população e da instância (a deteção de repetidos ordena as chaves de cada indivíduo).
+    def evaluate_population(self, populacao, clash_penalty=1000, workload_penalty=250, category_penalty=1000,
+                            bonus_threshold=460, bonus=200, mismatch_penalty=0):
+        equipas = np.asarray(populacao)
+        size = len(equipas)
+        idx = np.where(self.slots, equipas, 0)
+
+        # Duração de cada procedimento (enfermeiro mais lento) e de cada período (sala mais longa)
+        duracoes = np.where(self.slots, self.tempos[self._procedures, idx], 0).max(axis=2)
+        por_periodo = np.maximum.reduceat(duracoes[:, self._ordem], self._inicios, axis=1)
+        total_duration = por_periodo.sum(axis=1)
+
+        # Períodos com algum enfermeiro repetido: chaves (período, enfermeiro) iguais ficam seguidas depois de ordenar
+        chaves = np.where(self.slots, self.periodos[:, None] * self.num_nurses + idx, self._vazias)
+        ordenadas = np.sort(chaves.reshape(size, -1), axis=1)
+        linhas, colunas = np.nonzero(ordenadas[:, 1:] == ordenadas[:, :-1])
+        pares = np.unique(linhas * self.num_periods + ordenadas[linhas, colunas] // self.num_nurses)
+        repetidos = np.bincount(pares // self.num_periods, minlength=size)
+
+        # Participações acima do limite de cada enfermeiro
+        excesso = np.maximum(self._workload(idx) - self.caps, 0).sum(axis=1)
+
+        # Procedimentos com algum enfermeiro de uma categoria proibida
+        proibido = self.proibidas[self._procedures, self.categorias[idx]] & self.slots
+        categoria = proibido.any(axis=2).sum(axis=1)
+
+        fitness = (total_duration + clash_penalty * repetidos + workload_penalty * excesso
+                   + category_penalty * categoria)
+
+        # Bônus para soluções abaixo do limiar
+        fitness = np.where(fitness < bonus_threshold, fitness - bonus, fitness)
+        fitness = fitness + mismatch_penalty * (fitness != total_duration)
+
+        return -fitness, total_duration
+
+    def evaluate_fitness(self, cromossoma, **penalidades):
+        fitness, total_duration = self.evaluate_population(np.asarray(cromossoma)[None], **penalidades)
+        return int(fitness[0]), int(total_duration[0])
+
+    # Carga de cada enfermeiro em cada indivíduo
+    def _workload(self, populacao):
+        size = len(populacao)
+        deslocamento = (np.arange(size) * self.num_nurses)[:, None]
+        return np.bincount((populacao[:, self.slots] + deslocamento).ravel(),
+                           minlength=size * self.num_nurses).reshape(size, self.num_nurses)
+
+    # Amostragem construtiva de toda a população, período a período e posição a posição: cada enfermeiro é
+    # sorteado entre CANDIDATES candidatos aleatórios que podem fazer o procedimento, ainda não estão no período
+    # e ainda têm capacidade, com peso igual à capacidade que lhes resta. Só os indivíduos sem nenhum candidato
+    # válido percorrem todos os enfermeiros (relaxando a capacidade e depois a categoria), por isso o custo
+    # cresce com o número de posições e não com posições x enfermeiros.
+    def construct_population(self, size, rng):
+        populacao = np.full((size, self.num_procedures, self.max_team), LIVRE, dtype=np.int32)
+        livres = np.repeat(self.caps[None, :], size, axis=0)
+        usados = np.zeros((size, self.num_nurses), dtype=bool)
+        linhas = np.arange(size)
+
+        for k in rng.permutation(self.num_periods):
+            for procedure in self._por_periodo[k]:
+                for slot in range(self.team_sizes[procedure]):
+                    candidatos = rng.integers(0, self.num_nurses, (size, CANDIDATES))
+                    capacidade = livres[linhas[:, None], candidatos]
+                    validos = self.pode[procedure][candidatos] & ~usados[linhas[:, None], candidatos] & (capacidade > 0)
+
+                    # Sorteio ponderado vetorizado: argmax de u^(1/w) escolhe com probabilidade proporcional a w
+                    chave = np.where(validos, rng.random(candidatos.shape) ** (1 / np.maximum(capacidade, 1)), -1)
+                    enfermeiro = candidatos[linhas, chave.argmax(axis=1)]
+
+                    sem = np.flatnonzero(~validos.any(axis=1))
+                    if len(sem):
+                        enfermeiro[sem] = self._fallback(procedure, usados[sem], livres[sem], rng)
+
+                    populacao[:, procedure, slot] = enfermeiro
+                    usados[linhas, enfermeiro] = True
+                    livres[linhas, enfermeiro] -= 1
+
+            # Libertar os enfermeiros do período para o seguinte
+            usados[linhas[:, None, None], populacao[:, self._por_periodo[k]]] = False
+
+        return populacao
+
+    # Escolha com todos os enfermeiros, para os indivíduos sem candidatos válidos
+    def _fallback(self, procedure, usados, livres, rng):
+        mascara = self.pode[procedure] & ~usados & (livres > 0)
+        for alternativa in (self.pode[procedure] & ~usados, ~usados):
+            sem = ~mascara.any(axis=1)
+            if not sem.any():
+                break
+            mascara[sem] = alternativa[sem]
+        return np.where(mascara, rng.random(mascara.shape), -1).argmax(axis=1)
+
+    # Crossover uniforme por período: cada período (todas as suas salas) vem inteiro de um dos pais,
+    # para não criar enfermeiros repetidos dentro do período
+    def crossover(self, parents1, parents2, rng):
+        mascara = (rng.random((len(parents1), self.num_periods)) < 0.5)[:, self.periodos, None]
+        return np.where(mascara, parents1, parents2), np.where(mascara, parents2, parents1)
+
+    # Mutação: cada posição ocupada é trocada com probabilidade `rate` por um de CANDIDATES enfermeiros
+    # aleatórios que possa fazer o procedimento, não esteja no período e ainda tenha capacidade (ou, sem
+    # nenhum, que possa fazer o procedimento); sem candidatos, a posição fica como estava
+    def mutate(self, populacao, rate, rng):
+        individuos, procedimentos, posicoes = np.nonzero((rng.random(populacao.shape) < rate) & self.slots)
+        if not len(individuos):
+            return populacao
+
+        candidatos = rng.integers(0, self.num_nurses, (len(individuos), CANDIDATES))
+        pode = self.pode[procedimentos[:, None], candidatos]
+
+        # Enfermeiros já presentes no período (todas as salas) de cada posição mutada
+        no_periodo = populacao[individuos[:, None], self._salas[procedimentos]].reshape(len(individuos), -1)
+        repetido = (candidatos[:, :, None] == no_periodo[:, None, :]).any(axis=2)
+        livres = (self.caps - self._workload(populacao))[individuos[:, None], candidatos]
+
+        validos = pode & ~repetido & (livres > 0)
+        validos = np.where(validos.any(axis=1)[:, None], validos, pode)
+        novos = candidatos[np.arange(len(individuos)), validos.argmax(axis=1)]
+        populacao[individuos, procedimentos, posicoes] = np.where(validos.any(axis=1), novos,
+                                                                   populacao[individuos, procedimentos, posicoes])
+        return populacao
+
+
+# Seleção por torneio de toda a geração (k participantes por torneio, com reposição)
+def _tournament(fitness_scores, n, k, rng):
+    selected = rng.integers(0, len(fitness_scores), (n, k))
+    return selected[np.arange(n), fitness_scores[selected].argmax(axis=1)]
+
+
+# AG sobre a instância geral: população construtiva, torneio, crossover por período e mutação orientada,
+# com as operações de cada geração vetorizadas sobre toda a população. Para ao fim de `generations` gerações
+# ou do prazo `time_budget` (segundos). Devolve a melhor solução (procedimentos x max_team) e estatísticas.
+def genetic_algorithm(instance, population_size=POPULATION_SIZE, generations=GENERATIONS, tournament_k=TOURNAMENT_K,
+                      mutation_rate=MUTATION_RATE, time_budget=None, seed=None, observer=None, **penalidades):
+    rng = np.random.default_rng(seed)
+    start = time.perf_counter()
+    prazo = None if time_budget is None else start + time_budget
+    if mutation_rate is None:
+        mutation_rate = 2 / instance.size
+
+    population = instance.construct_population(population_size, rng)
+    fitness_scores, durations = instance.evaluate_population(population, **penalidades)
+    evaluations = len(population)
+    best = int(fitness_scores.argmax())
+    best_fitness, best_duration = int(fitness_scores[best]), int(durations[best])
+    best_solution = population[best].copy()
+
+    generation = 0
+    for generation in range(1, generations + 1):
+        if prazo is not None and time.perf_counter() >= prazo:
+            generation -= 1
+            break
+
+        parents = _tournament(fitness_scores, 2 * (population_size // 2), tournament_k, rng)
+        children1, children2 = instance.crossover(population[parents[0::2]], population[parents[1::2]], rng)
+        population = instance.mutate(np.concatenate((children1, children2)), mutation_rate, rng)
+        fitness_scores, durations = instance.evaluate_population(population, **penalidades)
+        evaluations += len(population)
+
+        best = int(fitness_scores.argmax())
+        if fitness_scores[best] > best_fitness:
+            best_fitness, best_duration = int(fitness_scores[best]), int(durations[best])
+            best_solution = population[best].copy()
+        if observer is not None:
+            observer(generation, best_fitness, best_duration)
+
+    elapsed = time.perf_counter() - start
+    return {
+        'solution': best_solution,
+        'fitness': best_fitness,
+        'duration': best_duration,
+        'feasible': -best_fitness <= best_duration,
+        'generations': generation,
+        'evaluations': evaluations,
+        'elapsed': elapsed,
+        'evaluations_per_second': evaluations / elapsed,
+    }
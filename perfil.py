@@ -0,0 +1,170 @@
+import json
+import time
+import tracemalloc
+
+TOP_ALLOCATIONS = 10  # Linhas de código com mais alocações vivas no fim, no resumo com memória
+# Com memória, os blocos alocados contam-se numa em cada MEMORY_SAMPLE_EVERY chamadas de cada fase, até
+# MEMORY_SAMPLES chamadas (cada uma custa dois snapshots, que copiam todos os blocos vivos)
+MEMORY_SAMPLE_EVERY = 100
+MEMORY_SAMPLES = 3
+
+
+# Tempo e número de chamadas de uma fase do AG. Com memória, também:
+# - net_bytes: saldo dos bytes alocados e libertados na fase (negativo se liberta mais do que aloca)
+# - peak_bytes: maior subida da memória durante uma chamada, incluindo os temporários já libertados no fim
+# - blocks/block_bytes: blocos (e os seus bytes) alocados nas chamadas amostradas e ainda vivos no fim
+#   delas, da diferença entre dois snapshots do tracemalloc (só nas chamadas amostradas e fora do tempo
+#   da fase)
+# O mesmo objeto é reutilizado em todas as chamadas da fase, para não alocar nada por chamada.
+class _Phase:
+    __slots__ = ('calls', 'seconds', 'net_bytes', 'peak_bytes', 'sampled', 'blocks', 'block_bytes',
+                 '_memoria', '_inicio', '_antes', '_snapshot')
+
+    def __init__(self, memoria):
+        self.calls = 0
+        self.seconds = 0.0
+        self.net_bytes = 0
+        self.peak_bytes = 0
+        self.sampled = 0
+        self.blocks = 0
+        self.block_bytes = 0
+        self._memoria = memoria
+        self._inicio = 0.0
+        self._antes = 0
+        self._snapshot = None
+
+    def __enter__(self):
+        if self._memoria:
+            if self.calls % MEMORY_SAMPLE_EVERY == 0 and self.sampled < MEMORY_SAMPLES:
+                self._snapshot = tracemalloc.take_snapshot()
+            tracemalloc.reset_peak()
+            self._antes = tracemalloc.get_traced_memory()[0]
+        self._inicio = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.seconds += time.perf_counter() - self._inicio
+        self.calls += 1
+        if self._memoria:
+            atual, pico = tracemalloc.get_traced_memory()
+            self.net_bytes += atual - self._antes
+            self.peak_bytes = max(self.peak_bytes, pico - self._antes)
+            if self._snapshot is not None:
+                for s in tracemalloc.take_snapshot().compare_to(self._snapshot, 'lineno'):
+                    if s.count_diff > 0 and s.traceback[0].filename != tracemalloc.__file__:
+                        self.blocks += s.count_diff
+                        self.block_bytes += s.size_diff
+                self.sampled += 1
+                self._snapshot = None
+
+
+# Instrumentação de uma execução: `with profiler.phase('selection'): ...` acumula tempo e chamadas por fase
+# e `profiler.count('evaluations', n)` soma contadores. Com `trace_memory`, o tracemalloc fica ligado
+# entre start() e stop() (abranda bastante a execução, por isso é opcional).
+class Profiler:
+    enabled = True
+
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.phases = {}
+        self.counters = {}
+        self.elapsed = 0.0
+        self._inicio = None
+        self._pico = 0
+        self._alocacoes = []
+        self._ligou_tracemalloc = False
+
+    def phase(self, name):
+        fase = self.phases.get(name)
+        if fase is None:
+            fase = self.phases[name] = _Phase(self.trace_memory)
+        return fase
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def start(self):
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._ligou_tracemalloc = True
+        self._inicio = time.perf_counter()
+
+    def stop(self):
+        self.elapsed += time.perf_counter() - self._inicio
+        if self.trace_memory and tracemalloc.is_tracing():
+            self._pico = tracemalloc.get_traced_memory()[1]
+            estatisticas = tracemalloc.take_snapshot().statistics('lineno')[:TOP_ALLOCATIONS]
+            self._alocacoes = [{'location': str(s.traceback[0]), 'count': s.count, 'size': s.size}
+                               for s in estatisticas]
+            if self._ligou_tracemalloc:
+                tracemalloc.stop()
+                self._ligou_tracemalloc = False
+
+    # Resumo serializável em JSON; `extra` (ex.: estatísticas da cache) é acrescentado tal como vem
+    def summary(self, **extra):
+        fases = {}
+        for name, fase in self.phases.items():
+            fases[name] = {
+                'calls': fase.calls,
+                'seconds': fase.seconds,
+                'mean_ms': 1000 * fase.seconds / fase.calls if fase.calls else 0.0,
+                'share': fase.seconds / self.elapsed if self.elapsed else 0.0,
+            }
+            if self.trace_memory:
+                fases[name].update({
+                    'net_bytes': fase.net_bytes,
+                    'peak_bytes': fase.peak_bytes,
+                    'sampled_calls': fase.sampled,
+                    'blocks_per_call': fase.blocks / fase.sampled if fase.sampled else 0.0,
+                    'block_bytes_per_call': fase.block_bytes / fase.sampled if fase.sampled else 0.0,
+                })
+        resumo = {
+            'elapsed': self.elapsed,
+            'phases': fases,
+            'unaccounted_seconds': self.elapsed - sum(fase.seconds for fase in self.phases.values()),
+            'counters': dict(self.counters),
+        }
+        if 'evaluations' in self.counters and self.elapsed:
+            resumo['evaluations_per_second'] = self.counters['evaluations'] / self.elapsed
+        if self.trace_memory:
+            resumo['memory'] = {'peak_bytes': self._pico, 'top_allocations': self._alocacoes}
+        resumo.update(extra)
+        return resumo
+
+    def export(self, path, **extra):
+        with open(path, 'w') as f:
+            json.dump(self.summary(**extra), f, indent=2)
+
+
+# Fase sem instrumentação: um único objeto partilhado, cujo with não faz nada
+class _NullPhase:
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc):
+        pass
+
+
+_NULL_PHASE = _NullPhase()
+
+
+# Instrumentação desligada, com a mesma interface do Profiler: cada fase custa uma chamada de método
+class _Disabled:
+    __slots__ = ()
+    enabled = False
+
+    def phase(self, name):
+        return _NULL_PHASE
+
+    def count(self, name, n=1):
+        pass
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+
+DISABLED = _Disabled()
@@ -0,0 +1,55 @@
+import time
+
+import numpy as np
+
+
+# Melhor fitness e duração por geração, guardados em arrays pré-alocados. Quando o número de gerações não é
+# conhecido (execução com prazo) a capacidade duplica ao encher, em vez de crescer a cada geração.
+class GenerationMetrics:
+    def __init__(self, capacity=1024):
+        self.size = 0
+        self._fitness = np.empty(max(capacity, 1), dtype=np.int64)
+        self._duration = np.empty(max(capacity, 1), dtype=np.int64)
+
+    def record(self, fitness, duration):
+        if self.size == len(self._fitness):
+            self._fitness = np.resize(self._fitness, 2 * self.size)
+            self._duration = np.resize(self._duration, 2 * self.size)
+        self._fitness[self.size] = fitness
+        self._duration[self.size] = duration
+        self.size += 1
+
+    @property
+    def best_fitness(self):
+        return self._fitness[:self.size]
+
+    @property
+    def best_duration(self):
+        return self._duration[:self.size]
+
+
+# Observador com limitação: passa a `callback(generation, fitness, duration)` só uma geração em cada
+# `every_generations` e/ou uma vez em cada `every_seconds` segundos (sem nenhum dos dois, todas as gerações)
+class Throttle:
+    def __init__(self, callback, every_generations=None, every_seconds=None):
+        self.callback = callback
+        self.every_generations = every_generations
+        self.every_seconds = every_seconds
+        self._next_time = time.perf_counter()
+
+    def __call__(self, generation, fitness, duration):
+        if self.every_generations is None and self.every_seconds is None:
+            due = True
+        else:
+            due = self.every_generations is not None and generation % self.every_generations == 0
+            if self.every_seconds is not None and not due:
+                due = time.perf_counter() >= self._next_time
+        if due:
+            if self.every_seconds is not None:
+                self._next_time = time.perf_counter() + self.every_seconds
+            self.callback(generation, fitness, duration)
+
+
+# Observador que imprime a linha de progresso habitual
+def print_progress(generation, fitness, duration):
+    print(f'Geração {generation}: Melhor Fitness = {fitness}, Duração = {duration}')
@@ -0,0 +1,168 @@
+import os
+import random
+
+# Ponto de entrada importável: junta o AG, o recozimento simulado, a pesquisa tabu e o solver exato.
+# O import só carrega a biblioteca padrão; NumPy, pandas e os módulos do solver são carregados na
+# primeira chamada a solve(), e nada é lido do disco nem executado no import.
+
+# Algoritmos disponíveis em solve()
+ALGORITHMS = ('ga', 'annealing', 'tabu', 'exact')
+
+# Pesos de penalização de cada variante: os do AG_final, os do AG_Alex (carga a 1000, sem bônus) e os do
+# AG Monteiro (os do AG_Alex, mais 1000 abaixo de 450 e mais 1000 quando o fitness difere da duração)
+VARIANTS = {
+    'final': {},
+    'alex': {'workload_penalty': 1000, 'bonus': 0},
+    'monteiro': {'workload_penalty': 1000, 'bonus_threshold': 450, 'bonus': -1000, 'mismatch_penalty': 1000},
+}
+
+# Tabela de combinações e limite inferior já calculados por instância, para um worker de longa duração
+# não os refazer
+MAX_CACHED_TABLES = 8
+_tabelas = {}
+
+
+# Instância como array de tempos (procedimento x enfermeiro): None lê Trab_Grupo.xlsx, um caminho lê esse
+# ficheiro e um array (ou lista de listas) é usado diretamente. Instâncias gerais (modelo.Instance, com
+# qualquer número de enfermeiros, procedimentos e salas) são passadas diretamente a solve().
+def load_instance(instance=None):
+    import numpy as np
+
+    import avaliacao
+
+    if instance is None:
+        return avaliacao.load_durations()
+    if isinstance(instance, (str, os.PathLike)):
+        return avaliacao.load_durations(instance)
+    return np.ascontiguousarray(instance, dtype=np.int32)
+
+
+def _table(tempos):
+    import combinacoes
+    import exato
+
+    chave = (tempos.shape, tempos.tobytes())
+    if chave not in _tabelas:
+        if len(_tabelas) >= MAX_CACHED_TABLES:
+            _tabelas.pop(next(iter(_tabelas)))
+        tabela = combinacoes.CombinationTable(tempos)
+        _tabelas[chave] = tabela, exato.lower_bound(tabela)
+    return _tabelas[chave]
+
+
+# Resolver uma instância. `config` pode ter:
+# - 'algorithm': um de ALGORITHMS (por omissão 'ga')
+# - 'variant': um de VARIANTS (pesos de penalização)
+# - 'seed': semente dos geradores aleatórios
+# - 'time_budget': prazo em segundos (AG)
+# - 'observer': observador de progresso do AG (ex.: progresso.Throttle)
+# - 'target_duration': alvo do recozimento simulado e da pesquisa tabu (por omissão o limite inferior)
+# - para o AG, qualquer constante do AG_final (ex.: 'POPULATION_SIZE', 'MEMETIC'), só durante esta chamada;
+#   para o recozimento e a pesquisa tabu, os argumentos das respetivas funções (ex.: 'iterations', 'cooling')
+# Devolve um dicionário com a solução (equipas por procedimento), fitness, duração, admissibilidade,
+# limite inferior, gap e estatísticas do algoritmo.
+def solve(instance=None, config=None):
+    import numpy as np
+
+    import AG_final
+    import combinacoes
+    import exato
+    import metaheuristicas
+    import modelo
+
+    config = dict(config or {})
+    algorithm = config.pop('algorithm', 'ga')
+    variant = config.pop('variant', 'final')
+    seed = config.pop('seed', None)
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f'Algoritmo desconhecido: {algorithm}')
+    if variant not in VARIANTS:
+        raise ValueError(f'Variante desconhecida: {variant}')
+    penalidades = VARIANTS[variant]
+
+    if isinstance(instance, modelo.Instance):
+        return _solve_general(instance, algorithm, seed, config, penalidades)
+
+    tempos = load_instance(instance)
+    tabela, limite = _table(tempos)
+    random.seed(seed)
+
+    match algorithm:
+        case 'ga':
+            time_budget = config.pop('time_budget', None)
+            observer = config.pop('observer', None)
+            for name in config:
+                if not name.isupper() or not hasattr(AG_final, name):
+                    raise ValueError(f'Definição desconhecida para o AG: {name}')
+
+            # As constantes e a instância do AG_final só mudam durante esta chamada
+            guardadas = {name: getattr(AG_final, name)
+                         for name in (*config, 'PENALTIES', 'rng', 'tempos', 'tabela', 'limite_inferior')}
+            try:
+                for name, value in config.items():
+                    setattr(AG_final, name, value)
+                AG_final.PENALTIES = penalidades
+                AG_final.rng = np.random.default_rng(seed)
+                AG_final.load_instance(tempos, tabela, limite)
+                solution, fitness, duration = AG_final.genetic_algorithm(time_budget=time_budget, observer=observer)
+            finally:
+                for name, value in guardadas.items():
+                    setattr(AG_final, name, value)
+                # A cache de fitness e os ótimos locais são desta instância e destes pesos
+                AG_final.cache.clear()
+                AG_final.otimos_locais.clear()
+            stats = dict(AG_final.stats)
+
+        case 'annealing' | 'tabu':
+            pesquisa = metaheuristicas.simulated_annealing if algorithm == 'annealing' else metaheuristicas.tabu_search
+            config.setdefault('target_duration', limite)
+            stats = pesquisa(tabela, tempos, **config, **penalidades)
+            solution, fitness, duration = stats.pop('solution'), stats.pop('fitness'), stats.pop('duration')
+
+        case 'exact':
+            stats = exato.solve(tabela, **config)
+            if stats is None:
+                return None  # Sem solução admissível
+            solution = stats.pop('solution')
+            fitness, duration = tabela.evaluate(solution, **penalidades)
+            stats.pop('duration')
+
+    # Admissibilidade com os pesos por omissão e sem bônus (os de uma variante podem subir o fitness)
+    feasible = AG_final.is_feasible(*tabela.evaluate(solution, bonus=0))
+    return {
+        'algorithm': algorithm,
+        'solution': combinacoes.decode(solution),
+        'fitness': int(fitness),
+        'duration': int(duration),
+        'feasible': feasible,
+        'lower_bound': limite,
+        'gap': int(duration) - limite if feasible else None,
+        'stats': stats,
+    }
+
+
+# Instância geral: só o AG de modelo.py (os restantes algoritmos dependem da tabela das 120 equipas);
+# `config` aceita os argumentos de modelo.genetic_algorithm (ex.: 'generations', 'time_budget')
+def _solve_general(instance, algorithm, seed, config, penalidades):
+    import modelo
+
+    if algorithm != 'ga':
+        raise ValueError(f'Algoritmo não disponível para instâncias gerais: {algorithm}')
+    stats = modelo.genetic_algorithm(instance, seed=seed, **config, **penalidades)
+    solution, fitness, duration = stats.pop('solution'), stats.pop('fitness'), stats.pop('duration')
+    return {
+        'algorithm': algorithm,
+        'solution': solution,
+        'fitness': fitness,
+        'duration': duration,
+        'feasible': stats.pop('feasible'),
+        'lower_bound': None,
+        'gap': None,
+        'stats': stats,
+    }
+
+
+if __name__ == '__main__':
+    for algorithm in ALGORITHMS:
+        resultado = solve(config={'algorithm': algorithm, 'seed': 1})
+        print(f"{algorithm}: Duração Total = {resultado['duration']}, gap = {resultado['gap']}")